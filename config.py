@@ -36,6 +36,8 @@ class Config:
     
     # Status channel for persistent messages
     STATUS_CHANNEL_ID = int(os.getenv('STATUS_CHANNEL_ID', 0)) if os.getenv('STATUS_CHANNEL_ID') else None
+    # File tracking the IDs of the status messages across restarts
+    STATUS_STATE_PATH = os.getenv('STATUS_STATE_PATH', './status_messages.json')
     
     # Security settings
     RATE_LIMIT_PER_USER = int(os.getenv('RATE_LIMIT_PER_USER', 5))
@@ -45,6 +47,9 @@ class Config:
     HEALTH_CHECK_PORT = int(os.getenv('HEALTH_CHECK_PORT', 8080))
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
+    # Local SQLite database for command usage statistics
+    STATS_DB_PATH = os.getenv('STATS_DB_PATH', './bot_state.db')
+    
     @classmethod
     def validate(cls):
         """Validate required configuration with enhanced moderator role checking"""
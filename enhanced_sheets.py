@@ -1,14 +1,17 @@
 # enhanced_sheets.py - Enhanced Google Sheets manager v5 with Producer Support
 import asyncio
+import heapq
 import time
 import secrets
 import re
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List, Pattern, Union
 import gspread
 from datetime import datetime
 import logging
 
+from local_index import LocalIndex
+
 logger = logging.getLogger(__name__)
 
 class RateLimiter:
@@ -49,6 +52,13 @@ class OptimizedSheetsManager:
         self.cache: Dict[str, Tuple[Any, float]] = {}
         self.cache_ttl = 300  # 5 minutes
         
+        # Local SQLite mirror for read-heavy lookups (refreshed when older than index_ttl)
+        self.index = LocalIndex()
+        self.index_ttl = 300  # 5 minutes
+        self.index_retry_interval = 30  # Minimum seconds between refresh attempts, also after a failure
+        self._index_attempted_at = 0.0
+        self._index_lock = asyncio.Lock()  # Single-flight refresh for concurrent stale reads
+        
         self._initialize_sheets()
     
     def _initialize_sheets(self):
@@ -311,6 +321,39 @@ class OptimizedSheetsManager:
             return "Unknown"
         return str(producer).strip()[:50]  # Limit length
     
+    def _to_int(self, value, default: int = 0) -> int:
+        """Coerce a sheet cell to int (empty or malformed cells become default)"""
+        try:
+            return int(float(value))
+        except (ValueError, TypeError):
+            return default
+    
+    def _to_float(self, value, default: float = 0.0) -> float:
+        """Coerce a sheet cell to float (empty or malformed cells become default)"""
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return default
+    
+    def _normalize_strain_records(self, records: List[Dict]) -> List[Dict]:
+        """Fill in missing columns and coerce numeric fields on Strains rows once at fetch time"""
+        for record in records:
+            # Handle cases where Category/Producer columns might not exist yet in existing data
+            if 'Category' not in record:
+                record['Category'] = 'flower'  # Default to flower for existing records
+            if 'Producer' not in record:
+                record['Producer'] = 'Unknown'  # Default producer for existing records
+            record['Average_Rating'] = self._to_float(record.get('Average_Rating', 0))
+            record['Total_Ratings'] = self._to_int(record.get('Total_Ratings', 0))
+        return records
+    
+    def _normalize_rating_records(self, records: List[Dict]) -> List[Dict]:
+        """Coerce Ratings rows to typed values and pre-slice the rating date"""
+        for record in records:
+            record['Rating'] = self._to_int(record.get('Rating', 0))
+            record['Date_Rated_Short'] = str(record.get('Date_Rated', 'Unknown'))[:10]
+        return records
+    
     async def safe_operation(self, operation):
         """Execute sheet operation with enhanced error handling"""
         async with self._lock:
@@ -324,6 +367,12 @@ class OptimizedSheetsManager:
                 logger.error(f"Sheet operation failed: {e}", exc_info=True)
                 return None
     
+    async def check_connection(self) -> bool:
+        """Liveness probe - runs on the executor without waiting behind queued operations for the lock"""
+        if self.spreadsheet is None:
+            return False
+        return await asyncio.get_event_loop().run_in_executor(self.executor, lambda: True)
+    
     async def cached_operation(self, cache_key: str, operation, cache_duration: int = None):
         """Execute operation with caching"""
         cache_duration = cache_duration or self.cache_ttl
@@ -332,7 +381,9 @@ class OptimizedSheetsManager:
         if cache_key in self.cache:
             data, timestamp = self.cache[cache_key]
             if time.time() - timestamp < cache_duration:
-                logger.debug(f"Cache hit for key: {cache_key}")
+                # Guarded so the message isn't built on this hot path unless debug logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Cache hit for key: {cache_key}")
                 return data
         
         # Execute operation
@@ -341,7 +392,8 @@ class OptimizedSheetsManager:
         # Cache result if successful
         if result is not None:
             self.cache[cache_key] = (result, time.time())
-            logger.debug(f"Cached result for key: {cache_key}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cached result for key: {cache_key}")
         
         return result
     
@@ -355,6 +407,45 @@ class OptimizedSheetsManager:
             self.cache.clear()
         logger.info(f"Cache cleared {'with prefix: ' + prefix if prefix else 'completely'}")
     
+    def _optional_records(self, sheet_name: str) -> List[Dict]:
+        """All records of a sheet, or none if the sheet doesn't exist"""
+        try:
+            return self.spreadsheet.worksheet(sheet_name).get_all_records()
+        except gspread.exceptions.WorksheetNotFound:
+            logger.warning(f"{sheet_name} sheet not found, indexing it as empty")
+            return []
+    
+    async def refresh_index(self, force: bool = True) -> bool:
+        """Mirror the Strains, Ratings and Submissions sheets into the local index"""
+        def operation():
+            strains = self._normalize_strain_records(self.spreadsheet.worksheet("Strains").get_all_records())
+            ratings = self._normalize_rating_records(self._optional_records("Ratings"))
+            submissions = self._optional_records("Submissions")
+            for record in ratings + submissions:
+                record['User_ID_Clean'] = self._extract_user_id_from_sheets(record.get('User_ID', ''))
+            self.index.load(strains, ratings, submissions)
+            return True
+        
+        async with self._index_lock:
+            # Another caller may have refreshed (or failed to) while this one waited
+            if not force and not self._index_stale():
+                return True
+            try:
+                return bool(await self.safe_operation(operation))
+            finally:
+                self._index_attempted_at = time.time()
+    
+    def _index_stale(self) -> bool:
+        """Whether the index is past its TTL and no refresh was attempted within the retry interval"""
+        now = time.time()
+        return (now - self.index.loaded_at >= self.index_ttl
+                and now - self._index_attempted_at >= self.index_retry_interval)
+    
+    async def _ensure_index(self):
+        """Refresh the local index if it has never been loaded or has gone stale"""
+        if self._index_stale() and not await self.refresh_index(force=False):
+            logger.warning("Local index refresh failed, serving last loaded data")
+    
     def _normalize_strain_name(self, name: str) -> str:
         """Normalize strain name for duplicate checking - case insensitive, remove special chars"""
         normalized = re.sub(r'[^a-zA-Z0-9]', '', name.lower())
@@ -395,18 +486,19 @@ class OptimizedSheetsManager:
     
     async def get_strain_by_identifier(self, identifier: str, category: str = None) -> Optional[Dict]:
         """Get strain by unique ID or name (with wildcard support), optionally filtered by category"""
+        # Fast path: exact ID or name match served from the local index
+        await self._ensure_index()
+        record = self.index.get_strain(identifier, category)
+        if record:
+            return record
+        
         cache_key = f"strain_search_{identifier.lower()}_{category or 'all'}"
         
         def operation():
             strains_sheet = self.spreadsheet.worksheet("Strains")
             records = strains_sheet.get_all_records()
             
-            # Handle cases where Category/Producer columns might not exist yet in existing data
-            for record in records:
-                if 'Category' not in record:
-                    record['Category'] = 'flower'  # Default to flower for existing records
-                if 'Producer' not in record:
-                    record['Producer'] = 'Unknown'  # Default producer for existing records
+            self._normalize_strain_records(records)
             
             # Filter by category if specified
             if category:
@@ -441,45 +533,10 @@ class OptimizedSheetsManager:
         
         return await self.cached_operation(cache_key, operation, cache_duration=60)
     
-    async def search_strains(self, query: str, category: str = None) -> List[Dict]:
-        """Search for multiple strains matching query, optionally filtered by category"""
-        def operation():
-            strains_sheet = self.spreadsheet.worksheet("Strains")
-            records = strains_sheet.get_all_records()
-            matches = []
-            
-            # Handle cases where Category/Producer columns might not exist yet in existing data
-            for record in records:
-                if 'Category' not in record:
-                    record['Category'] = 'flower'  # Default to flower for existing records
-                if 'Producer' not in record:
-                    record['Producer'] = 'Unknown'  # Default producer for existing records
-            
-            # Filter by category if specified
-            if category:
-                records = [r for r in records if str(r.get('Category', 'flower')).lower() == category.lower()]
-            
-            # Handle wildcard search
-            if '*' in query or '?' in query:
-                pattern = query.replace('*', '.*').replace('?', '.')
-                regex = re.compile(pattern, re.IGNORECASE)
-                for record in records:
-                    strain_name = str(record['Strain_Name'])
-                    unique_id = str(record.get('Unique_ID', ''))
-                    if regex.search(strain_name) or regex.search(unique_id):
-                        matches.append(record)
-            else:
-                # Partial matching
-                query_lower = query.lower()
-                for record in records:
-                    strain_name = str(record['Strain_Name']).lower()
-                    unique_id = str(record.get('Unique_ID', '')).lower()
-                    if (query_lower in strain_name or query_lower in unique_id):
-                        matches.append(record)
-            
-            return matches[:10]  # Limit to 10 results
-        
-        return await self.safe_operation(operation) or []
+    async def search_strains(self, query: Union[str, Pattern], category: str = None) -> List[Dict]:
+        """Search for multiple strains matching query (substring or compiled wildcard pattern), optionally filtered by category"""
+        await self._ensure_index()
+        return self.index.search_strains(query, category, limit=10)  # Limit to 10 results
     
     async def add_strain_submission(self, strain_name: str, harvest_date: str, package_date: str, category: str, producer: str, user_id: int, username: str = "") -> Optional[str]:
         """Add new strain submission with category, producer support and username - returns unique_id if successful"""
@@ -504,22 +561,36 @@ class OptimizedSheetsManager:
                 # Add to Strains sheet (using display format for user visibility)
                 strains_sheet = self.spreadsheet.worksheet("Strains")
                 
+                date_added = datetime.now().strftime("%Y-%m-%d")
                 strains_sheet.append_row([
                     unique_id,
                     strain_name,
                     "Pending",
                     0,
                     0,
-                    datetime.now().strftime("%Y-%m-%d"),
+                    date_added,
                     harvest_date,  # Keep in DD-MM-YYYY format for display
                     package_date,  # Keep in DD-MM-YYYY format for display
                     category.lower(),  # Add category column
                     sanitized_producer  # Add producer column
                 ])
+                self.index.upsert_strain({
+                    'Unique_ID': unique_id,
+                    'Strain_Name': strain_name,
+                    'Status': 'Pending',
+                    'Category': category.lower(),
+                    'Producer': sanitized_producer,
+                    'Harvest_Date': harvest_date,
+                    'Package_Date': package_date,
+                    'Date_Added': date_added,
+                    'Average_Rating': 0.0,
+                    'Total_Ratings': 0
+                })
                 
                 # Add to Submissions sheet for tracking
                 submissions_sheet = self.spreadsheet.worksheet("Submissions")
                 next_submission_id = len(submissions_sheet.get_all_values())
+                submitted_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 submissions_sheet.append_row([
                     next_submission_id,
                     unique_id,
@@ -527,11 +598,23 @@ class OptimizedSheetsManager:
                     formatted_user_id,  # Use formatted user ID
                     harvest_date,  # Keep in DD-MM-YYYY format
                     package_date,  # Keep in DD-MM-YYYY format
-                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    submitted_at,
                     category.lower(),
                     sanitized_producer,  # Store producer for tracking
                     sanitized_username  # Store username for tracking
                 ])
+                self.index.add_submission({
+                    'Submission_ID': next_submission_id,
+                    'Unique_ID': unique_id,
+                    'Strain_Name': strain_name,
+                    'User_ID_Clean': user_id,
+                    'Harvest_Date': harvest_date,
+                    'Package_Date': package_date,
+                    'Date_Added': submitted_at,
+                    'Category': category.lower(),
+                    'Producer': sanitized_producer,
+                    'Username': sanitized_username
+                })
                 
                 return unique_id
             except Exception as e:
@@ -540,8 +623,8 @@ class OptimizedSheetsManager:
         
         return await self.safe_operation(operation)
     
-    async def add_rating(self, identifier: str, user_id: int, rating: int, username: str, category: str = None) -> bool:
-        """Add user rating for a strain (by unique ID or name), optionally filtered by category"""
+    async def add_rating(self, identifier: str, user_id: int, rating: int, username: str, category: str = None) -> Optional[Dict]:
+        """Add user rating for a strain (by unique ID or name), optionally filtered by category - returns the updated strain if successful"""
         def operation():
             return self._add_rating_operation(identifier, user_id, rating, username, category)
         
@@ -553,7 +636,7 @@ class OptimizedSheetsManager:
             self.clear_cache("top_strains")
         return result
     
-    def _add_rating_operation(self, identifier: str, user_id: int, rating: int, username: str, category: str = None) -> bool:
+    def _add_rating_operation(self, identifier: str, user_id: int, rating: int, username: str, category: str = None) -> Optional[Dict]:
         """Internal rating operation with identifier, username, and category support"""
         try:
             ratings_sheet = self.spreadsheet.worksheet("Ratings")
@@ -562,12 +645,7 @@ class OptimizedSheetsManager:
             ratings = ratings_sheet.get_all_records()
             strains = strains_sheet.get_all_records()
             
-            # Handle cases where Category/Producer columns might not exist yet in existing data
-            for strain in strains:
-                if 'Category' not in strain:
-                    strain['Category'] = 'flower'  # Default to flower for existing records
-                if 'Producer' not in strain:
-                    strain['Producer'] = 'Unknown'  # Default producer for existing records
+            self._normalize_strain_records(strains)
             
             # Filter strains by category if specified
             if category:
@@ -585,7 +663,7 @@ class OptimizedSheetsManager:
                     break
             
             if not strain_data or strain_data['Status'] != 'Approved':
-                return False
+                return None
             
             # Check for duplicate rating using Unique_ID
             formatted_user_id = self._format_user_id_for_sheets(user_id)
@@ -597,21 +675,30 @@ class OptimizedSheetsManager:
                 # Handle both formatted and unformatted user IDs
                 if (rating_unique_id == strain_unique_id and 
                     (record_user_id == str(user_id) or record_user_id == formatted_user_id)):
-                    return False  # User already rated this strain
+                    return None  # User already rated this strain
             
             # Sanitize username
             sanitized_username = self._sanitize_username(username)
             
             # Add new rating with username (always include username column)
             next_rating_id = len(ratings) + 1
+            rated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             ratings_sheet.append_row([
                 next_rating_id,
                 str(strain_data['Unique_ID']),  # Ensure it's a string
                 formatted_user_id,  # Use formatted user ID
                 rating,
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                rated_at,
                 sanitized_username  # Always add username as 6th column
             ])
+            self.index.add_rating({
+                'Rating_ID': next_rating_id,
+                'Unique_ID': str(strain_data['Unique_ID']),
+                'User_ID_Clean': user_id,
+                'Rating': rating,
+                'Date_Rated': rated_at,
+                'Username': sanitized_username
+            })
             
             # Update strain average
             strain_unique_id = str(strain_data['Unique_ID'])
@@ -627,12 +714,22 @@ class OptimizedSheetsManager:
                     strains_sheet.update_cell(i, 4, round(avg_rating, 2))  # Average_Rating (column D)
                     strains_sheet.update_cell(i, 5, total_ratings)  # Total_Ratings (column E)
                     break
+            self.index.update_strain(
+                strain_unique_id,
+                Average_Rating=round(avg_rating, 2),
+                Total_Ratings=total_ratings
+            )
             
-            return True
+            # Return the updated strain so callers don't need to re-read it
+            return {
+                **strain_data,
+                'Average_Rating': round(avg_rating, 2),
+                'Total_Ratings': total_ratings
+            }
             
         except Exception as e:
             logger.error(f"Error in _add_rating_operation: {e}", exc_info=True)
-            return False
+            return None
     
     async def get_top_strains_for_status(self, category: str, limit: int = 10) -> List[Dict]:
         """Get top rated strains for status display with category filter"""
@@ -642,88 +739,30 @@ class OptimizedSheetsManager:
             strains_sheet = self.spreadsheet.worksheet("Strains")
             records = strains_sheet.get_all_records()
             
-            # Handle cases where Category/Producer columns might not exist yet in existing data
-            for record in records:
-                if 'Category' not in record:
-                    record['Category'] = 'flower'  # Default to flower for existing records
-                if 'Producer' not in record:
-                    record['Producer'] = 'Unknown'  # Default producer for existing records
+            self._normalize_strain_records(records)
             
             # Filter for approved strains with ratings in the specified category
             approved_with_ratings = [
                 r for r in records 
                 if (r['Status'] == 'Approved' and 
-                    int(r.get('Total_Ratings', 0)) > 0 and
+                    r['Total_Ratings'] > 0 and
                     str(r.get('Category', 'flower')).lower() == category.lower())
             ]
             
-            # Sort by average rating (desc)
-            sorted_strains = sorted(
-                approved_with_ratings, 
-                key=lambda x: float(x.get('Average_Rating', 0)), 
-                reverse=True
+            # Top N by average rating (desc), ties broken by number of ratings
+            return heapq.nlargest(
+                limit,
+                approved_with_ratings,
+                key=lambda x: (x['Average_Rating'], x['Total_Ratings'])
             )
-            
-            return sorted_strains[:limit]
         
         return await self.cached_operation(cache_key, operation, cache_duration=120) or []
     
     async def get_recent_ratings_for_status(self, limit: int = 10) -> List[Dict]:
         """Get recent ratings for status display with user info, proper user ID handling, and producer info"""
-        def operation():
-            try:
-                ratings_sheet = self.spreadsheet.worksheet("Ratings")
-                strains_sheet = self.spreadsheet.worksheet("Strains")
-                
-                ratings = ratings_sheet.get_all_records()
-                strains = strains_sheet.get_all_records()
-                
-                # Handle cases where Producer column might not exist yet
-                for strain in strains:
-                    if 'Producer' not in strain:
-                        strain['Producer'] = 'Unknown'
-                
-                # Create strain lookup using Unique_ID (convert to string for safety)
-                strain_lookup = {str(s.get('Unique_ID', '')): s for s in strains}
-                
-                # Sort ratings by date (newest first)
-                sorted_ratings = sorted(ratings, 
-                                      key=lambda x: x.get('Date_Rated', ''), 
-                                      reverse=True)
-                
-                # Combine rating data with strain info
-                enriched_ratings = []
-                for rating in sorted_ratings[:limit]:
-                    rating_unique_id = str(rating.get('Unique_ID', ''))
-                    strain_info = strain_lookup.get(rating_unique_id, {})
-                    
-                    # Only include ratings for approved strains
-                    if strain_info.get('Status') == 'Approved':
-                        # Extract user ID properly
-                        user_id = self._extract_user_id_from_sheets(rating.get('User_ID', ''))
-                        
-                        # Use stored username if available, otherwise fall back to User-ID format
-                        stored_username = rating.get('Username', '').strip()
-                        username = stored_username if stored_username else f"User-{user_id}"
-                        
-                        enriched_rating = {
-                            **rating,
-                            'User_ID_Clean': user_id,  # Add clean user ID
-                            'Username_Display': username,  # Add display username
-                            'Strain_Name': strain_info.get('Strain_Name', 'Unknown'),
-                            'Harvest_Date': strain_info.get('Harvest_Date', 'N/A'),
-                            'Package_Date': strain_info.get('Package_Date', 'N/A'),
-                            'Category': strain_info.get('Category', 'flower'),
-                            'Producer': strain_info.get('Producer', 'Unknown')  # Add producer info
-                        }
-                        enriched_ratings.append(enriched_rating)
-                
-                return enriched_ratings[:limit]  # Limit after filtering
-            except Exception as e:
-                logger.error(f"Error getting recent ratings for status: {e}")
-                return []
-        
-        return await self.safe_operation(operation) or []
+        await self._ensure_index()
+        # Only ratings of approved strains among the newest ones are shown
+        return self.index.last_ratings(limit, approved_only=True, missing='N/A')
     
     async def get_all_approved_strains(self, category: str = None) -> List[Dict]:
         """Get all approved strains with their ratings, optionally filtered by category"""
@@ -733,12 +772,7 @@ class OptimizedSheetsManager:
             strains_sheet = self.spreadsheet.worksheet("Strains")
             records = strains_sheet.get_all_records()
             
-            # Handle cases where Category/Producer columns might not exist yet in existing data
-            for record in records:
-                if 'Category' not in record:
-                    record['Category'] = 'flower'  # Default to flower for existing records
-                if 'Producer' not in record:
-                    record['Producer'] = 'Unknown'  # Default producer for existing records
+            self._normalize_strain_records(records)
             
             # Filter for approved strains
             approved = [r for r in records if r['Status'] == 'Approved']
@@ -749,10 +783,8 @@ class OptimizedSheetsManager:
             
             # Sort by average rating (desc), but put unrated strains at the end
             def sort_key(strain):
-                rating = float(strain.get('Average_Rating', 0))
-                total_ratings = int(strain.get('Total_Ratings', 0))
                 # If no ratings, use -1 to put at end, otherwise use actual rating
-                return rating if total_ratings > 0 else -1
+                return strain['Average_Rating'] if strain['Total_Ratings'] > 0 else -1
             
             sorted_strains = sorted(approved, key=sort_key, reverse=True)
             
@@ -760,6 +792,11 @@ class OptimizedSheetsManager:
         
         return await self.cached_operation(cache_key, operation, cache_duration=120) or []
     
+    async def get_top_approved_strains(self, category: str = None, limit: int = 15) -> Tuple[List[Dict], int]:
+        """Get the top approved strains (same order as get_all_approved_strains) and the total approved count"""
+        await self._ensure_index()
+        return self.index.top_approved_strains(category, limit)
+    
     # Keep existing methods but update for category and producer support where needed
     async def get_pending_strains(self) -> List[Dict]:
         """Get all pending strain submissions"""
@@ -767,48 +804,53 @@ class OptimizedSheetsManager:
             strains_sheet = self.spreadsheet.worksheet("Strains")
             records = strains_sheet.get_all_records()
             
-            # Handle cases where Category/Producer columns might not exist yet in existing data
-            for record in records:
-                if 'Category' not in record:
-                    record['Category'] = 'flower'  # Default to flower for existing records
-                if 'Producer' not in record:
-                    record['Producer'] = 'Unknown'  # Default producer for existing records
+            self._normalize_strain_records(records)
             
             return [record for record in records if record['Status'] == 'Pending']
         
         result = await self.safe_operation(operation)
         return result or []
     
-    async def approve_strain(self, identifier: str) -> bool:
-        """Approve a pending strain submission by unique ID or name"""
+    async def approve_strain(self, identifier: str) -> Optional[Tuple[bool, Optional[Dict]]]:
+        """Approve a pending strain submission by unique ID or name - returns (success, matched row before the update), None if the sheet operation failed"""
         def operation():
             strains_sheet = self.spreadsheet.worksheet("Strains")
             records = strains_sheet.get_all_records()
+            identifier_upper = identifier.upper()
+            identifier_lower = identifier.lower()
+            first_match = None
             
             for i, record in enumerate(records, start=2):  # Start at row 2 (skip header)
                 # Convert Unique_ID to string to handle cases where it's read as int
                 unique_id_str = str(record.get('Unique_ID', '')).upper()
                 strain_name_str = str(record.get('Strain_Name', '')).lower()
-                identifier_upper = identifier.upper()
-                identifier_lower = identifier.lower()
                 
                 # Check by unique ID or name
-                if ((unique_id_str == identifier_upper) or
-                    (strain_name_str == identifier_lower)) and \
-                   record['Status'] == 'Pending':
+                if unique_id_str != identifier_upper and strain_name_str != identifier_lower:
+                    continue
+                
+                if record['Status'] == 'Pending':
                     strains_sheet.update_cell(i, 3, "Approved")  # Column C = Status
-                    return True
-            return False
+                    self.index.update_strain(str(record.get('Unique_ID', '')), Status="Approved")
+                    return True, self._normalize_strain_records([record])[0]
+                
+                # Remember a non-pending match so callers can tell "already approved" from "not found"
+                if first_match is None:
+                    first_match = record
+            
+            if first_match is not None:
+                first_match = self._normalize_strain_records([first_match])[0]
+            return False, first_match
         
         result = await self.safe_operation(operation)
-        if result:
+        if result and result[0]:
             # Clear cache since data changed
             self.clear_cache(f"strain_")
             self.clear_cache("top_strains")
         return result
     
-    async def rename_strain(self, unique_id: str, new_name: str) -> bool:
-        """Rename a strain by unique ID"""
+    async def rename_strain(self, unique_id: str, new_name: str) -> Optional[Tuple[bool, Optional[Dict]]]:
+        """Rename a strain by unique ID - returns (renamed, row before the rename), None if the sheet operation failed"""
         def operation():
             try:
                 strains_sheet = self.spreadsheet.worksheet("Strains")
@@ -817,14 +859,15 @@ class OptimizedSheetsManager:
                 for i, record in enumerate(records, start=2):  # Start at row 2 (skip header)
                     if str(record.get('Unique_ID', '')).upper() == unique_id.upper():
                         strains_sheet.update_cell(i, 2, new_name)  # Column B = Strain_Name
-                        return True
-                return False
+                        self.index.update_strain(str(record.get('Unique_ID', '')), Strain_Name=new_name)
+                        return True, self._normalize_strain_records([record])[0]
+                return False, None
             except Exception as e:
                 logger.error(f"Error renaming strain: {e}")
-                return False
+                return None
         
         result = await self.safe_operation(operation)
-        if result:
+        if result and result[0]:
             # Clear cache since data changed
             self.clear_cache(f"strain_")
             self.clear_cache("top_strains")
@@ -832,30 +875,8 @@ class OptimizedSheetsManager:
     
     async def get_strain_ratings_with_users(self, unique_id: str, limit: int = 5) -> List[Dict]:
         """Get recent ratings for a specific strain with user info"""
-        def operation():
-            try:
-                ratings_sheet = self.spreadsheet.worksheet("Ratings")
-                ratings = ratings_sheet.get_all_records()
-                
-                # Filter ratings for this strain and sort by date (newest first)
-                strain_ratings = [r for r in ratings if str(r.get('Unique_ID', '')) == str(unique_id)]
-                sorted_ratings = sorted(strain_ratings, 
-                                      key=lambda x: x.get('Date_Rated', ''), 
-                                      reverse=True)
-                
-                # Add clean user IDs and display usernames
-                for rating in sorted_ratings:
-                    rating['User_ID_Clean'] = self._extract_user_id_from_sheets(rating.get('User_ID', ''))
-                    # Use stored username if available, otherwise fall back to User-ID format
-                    stored_username = rating.get('Username', '').strip()
-                    rating['Username_Display'] = stored_username if stored_username else f"User-{rating['User_ID_Clean']}"
-                
-                return sorted_ratings[:limit]
-            except Exception as e:
-                logger.error(f"Error getting strain ratings: {e}")
-                return []
-        
-        return await self.safe_operation(operation) or []
+        await self._ensure_index()
+        return self.index.ratings_for_strain(unique_id, limit)
     
     async def get_pending_strains_count(self) -> int:
         """Get count of pending strains for notifications"""
@@ -873,87 +894,11 @@ class OptimizedSheetsManager:
         return await self.get_strain_by_identifier(strain_name)
     
     async def get_last_submissions(self, limit: int = 10) -> List[Dict]:
-        """Get last N strain submissions with proper user ID handling, usernames, and producer info"""
-        def operation():
-            try:
-                submissions_sheet = self.spreadsheet.worksheet("Submissions")
-                records = submissions_sheet.get_all_records()
-                
-                # Add clean user IDs to records and handle missing Category/Producer/Username columns
-                for record in records:
-                    record['User_ID_Clean'] = self._extract_user_id_from_sheets(record.get('User_ID', ''))
-                    # Handle cases where Category column might not exist yet
-                    if 'Category' not in record:
-                        record['Category'] = 'flower'  # Default to flower for existing records
-                    # Handle producer field for newer records
-                    if 'Producer' not in record:
-                        record['Producer'] = 'Unknown'  # Default for older records
-                    # Handle username field for newer records
-                    if 'Username' not in record:
-                        record['Username'] = ''  # Empty for older records
-                
-                # Sort by date (newest first) and return last N
-                sorted_records = sorted(records, 
-                                      key=lambda x: x.get('Date_Added', ''), 
-                                      reverse=True)
-                return sorted_records[:limit]
-            except gspread.exceptions.WorksheetNotFound:
-                logger.warning("Submissions sheet not found")
-                return []
-        
-        return await self.safe_operation(operation) or []
+        """Get last N strain submissions with usernames (stored or previously resolved) and producer info"""
+        await self._ensure_index()
+        return self.index.last_submissions(limit)
     
     async def get_last_ratings(self, limit: int = 10) -> List[Dict]:
         """Get last N ratings with strain information, proper user ID handling, and producer info"""
-        def operation():
-            try:
-                ratings_sheet = self.spreadsheet.worksheet("Ratings")
-                strains_sheet = self.spreadsheet.worksheet("Strains")
-                
-                ratings = ratings_sheet.get_all_records()
-                strains = strains_sheet.get_all_records()
-                
-                # Handle cases where Producer column might not exist yet
-                for strain in strains:
-                    if 'Producer' not in strain:
-                        strain['Producer'] = 'Unknown'
-                
-                # Create strain lookup using Unique_ID (convert to string for safety)
-                strain_lookup = {str(s.get('Unique_ID', '')): s for s in strains}
-                
-                # Sort ratings by date (newest first)
-                sorted_ratings = sorted(ratings, 
-                                      key=lambda x: x.get('Date_Rated', ''), 
-                                      reverse=True)
-                
-                # Combine rating data with strain info
-                enriched_ratings = []
-                for rating in sorted_ratings[:limit]:
-                    rating_unique_id = str(rating.get('Unique_ID', ''))
-                    strain_info = strain_lookup.get(rating_unique_id, {})
-                    
-                    # Extract clean user ID
-                    user_id_clean = self._extract_user_id_from_sheets(rating.get('User_ID', ''))
-                    
-                    # Use stored username if available, otherwise fall back to User-ID format
-                    stored_username = rating.get('Username', '').strip()
-                    username_display = stored_username if stored_username else f"User-{user_id_clean}"
-                    
-                    enriched_rating = {
-                        **rating,
-                        'User_ID_Clean': user_id_clean,
-                        'Username_Display': username_display,
-                        'Strain_Name': strain_info.get('Strain_Name', 'Unknown'),
-                        'Harvest_Date': strain_info.get('Harvest_Date', 'Unknown'),
-                        'Package_Date': strain_info.get('Package_Date', 'Unknown'),
-                        'Category': strain_info.get('Category', 'flower'),
-                        'Producer': strain_info.get('Producer', 'Unknown')  # Add producer info
-                    }
-                    enriched_ratings.append(enriched_rating)
-                
-                return enriched_ratings
-            except Exception as e:
-                logger.error(f"Error getting last ratings: {e}")
-                return []
-        
-        return await self.safe_operation(operation) or []
+        await self._ensure_index()
+        return self.index.last_ratings(limit)
@@ -0,0 +1,308 @@
+# local_index.py - In-memory SQLite mirror of the Google Sheets data
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Iterable, List, Optional, Pattern, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Shape of the generated unique IDs (8 hex characters)
+_UNIQUE_ID_RE = re.compile(r'^[0-9A-Fa-f]{8}$')
+
+class LocalIndex:
+    """In-memory SQLite index mirroring the Strains, Ratings and Submissions sheets for fast local reads"""
+
+    STRAIN_COLUMNS = (
+        "Unique_ID", "Strain_Name", "Status", "Category", "Producer",
+        "Harvest_Date", "Package_Date", "Date_Added", "Average_Rating", "Total_Ratings"
+    )
+    RATING_COLUMNS = (
+        "Rating_ID", "Unique_ID", "User_ID_Clean", "Rating", "Date_Rated", "Username"
+    )
+    SUBMISSION_COLUMNS = (
+        "Submission_ID", "Unique_ID", "Strain_Name", "User_ID_Clean", "Harvest_Date",
+        "Package_Date", "Date_Added", "Category", "Producer", "Username"
+    )
+
+    def __init__(self, user_ttl: int = 600):
+        # Written from the sheets executor threads and read from the event loop
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self.loaded_at = 0.0
+        self.user_ttl = user_ttl  # Seconds a resolved Discord display name stays valid
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create tables and lookup indexes"""
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE strains (
+                    Unique_ID TEXT PRIMARY KEY,
+                    Strain_Name TEXT NOT NULL DEFAULT '',
+                    Status TEXT NOT NULL DEFAULT '',
+                    Category TEXT NOT NULL DEFAULT 'flower',
+                    Producer TEXT NOT NULL DEFAULT 'Unknown',
+                    Harvest_Date TEXT NOT NULL DEFAULT '',
+                    Package_Date TEXT NOT NULL DEFAULT '',
+                    Date_Added TEXT NOT NULL DEFAULT '',
+                    Average_Rating REAL NOT NULL DEFAULT 0,
+                    Total_Ratings INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX idx_strains_name ON strains (Strain_Name COLLATE NOCASE);
+                CREATE INDEX idx_strains_status ON strains (Status);
+                CREATE INDEX idx_strains_category ON strains (Category);
+
+                CREATE TABLE ratings (
+                    Rating_ID TEXT,
+                    Unique_ID TEXT NOT NULL,
+                    User_ID_Clean INTEGER NOT NULL DEFAULT 0,
+                    Rating INTEGER NOT NULL DEFAULT 0,
+                    Date_Rated TEXT NOT NULL DEFAULT '',
+                    Username TEXT NOT NULL DEFAULT ''
+                );
+                CREATE INDEX idx_ratings_strain ON ratings (Unique_ID, Date_Rated);
+                CREATE INDEX idx_ratings_date ON ratings (Date_Rated);
+
+                CREATE TABLE submissions (
+                    Submission_ID TEXT,
+                    Unique_ID TEXT NOT NULL,
+                    Strain_Name TEXT NOT NULL DEFAULT '',
+                    User_ID_Clean INTEGER NOT NULL DEFAULT 0,
+                    Harvest_Date TEXT NOT NULL DEFAULT '',
+                    Package_Date TEXT NOT NULL DEFAULT '',
+                    Date_Added TEXT NOT NULL DEFAULT '',
+                    Category TEXT NOT NULL DEFAULT 'flower',
+                    Producer TEXT NOT NULL DEFAULT 'Unknown',
+                    Username TEXT NOT NULL DEFAULT ''
+                );
+                CREATE INDEX idx_submissions_date ON submissions (Date_Added);
+
+                CREATE TABLE users (
+                    id INTEGER PRIMARY KEY,
+                    display_name TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+            """)
+
+    @staticmethod
+    def _row_values(record: Dict[str, Any], columns: Iterable[str]) -> tuple:
+        """Extract column values from a sheet record, storing IDs as text"""
+        values = []
+        for column in columns:
+            value = record.get(column, '')
+            if column in ('Unique_ID', 'Rating_ID', 'Submission_ID'):
+                value = str(value)
+            values.append(value)
+        return tuple(values)
+
+    def _insert_sql(self, table: str, columns: tuple, verb: str = "INSERT") -> str:
+        return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    def load(self, strains: List[Dict], ratings: List[Dict], submissions: List[Dict]):
+        """Replace the index contents with freshly fetched (normalized) sheet records"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM strains")
+            self._conn.execute("DELETE FROM ratings")
+            self._conn.execute("DELETE FROM submissions")
+            self._conn.executemany(
+                self._insert_sql("strains", self.STRAIN_COLUMNS, "INSERT OR REPLACE"),
+                (self._row_values(r, self.STRAIN_COLUMNS) for r in strains if str(r.get('Unique_ID', '')))
+            )
+            self._conn.executemany(
+                self._insert_sql("ratings", self.RATING_COLUMNS),
+                (self._row_values(r, self.RATING_COLUMNS) for r in ratings)
+            )
+            self._conn.executemany(
+                self._insert_sql("submissions", self.SUBMISSION_COLUMNS),
+                (self._row_values(r, self.SUBMISSION_COLUMNS) for r in submissions)
+            )
+        self.loaded_at = time.time()
+        logger.info(f"Local index loaded: {len(strains)} strains, {len(ratings)} ratings, {len(submissions)} submissions")
+
+    def upsert_strain(self, record: Dict[str, Any]):
+        """Insert or replace a single strain row"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                self._insert_sql("strains", self.STRAIN_COLUMNS, "INSERT OR REPLACE"),
+                self._row_values(record, self.STRAIN_COLUMNS)
+            )
+
+    def update_strain(self, unique_id: str, **fields):
+        """Update selected columns of a strain row"""
+        columns = [column for column in fields if column in self.STRAIN_COLUMNS]
+        if not columns:
+            return
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE strains SET {assignments} WHERE Unique_ID = ?",
+                (*(fields[column] for column in columns), str(unique_id))
+            )
+
+    def add_rating(self, record: Dict[str, Any]):
+        """Append a rating row"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                self._insert_sql("ratings", self.RATING_COLUMNS),
+                self._row_values(record, self.RATING_COLUMNS)
+            )
+
+    def add_submission(self, record: Dict[str, Any]):
+        """Append a submission row"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                self._insert_sql("submissions", self.SUBMISSION_COLUMNS),
+                self._row_values(record, self.SUBMISSION_COLUMNS)
+            )
+
+    def get_display_names(self, user_ids: Iterable[int]) -> Dict[int, str]:
+        """Resolved display names that are still fresh, keyed by user ID"""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, display_name FROM users WHERE updated_at >= ? AND id IN ({', '.join('?' * len(user_ids))})",
+                (time.time() - self.user_ttl, *user_ids)
+            ).fetchall()
+        return {row['id']: row['display_name'] for row in rows}
+    
+    def store_display_names(self, names: Dict[int, str]):
+        """Remember resolved display names"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO users (id, display_name, updated_at) VALUES (?, ?, ?)",
+                ((user_id, name, now) for user_id, name in names.items())
+            )
+    
+    def last_submissions(self, limit: int = 10) -> List[Dict]:
+        """Newest submissions with the username filled from the users table when the sheet has none"""
+        plain_columns = ", ".join(
+            f"s.{column}" for column in self.SUBMISSION_COLUMNS if column not in ("Username", "Category", "Producer")
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT {plain_columns},
+                       COALESCE(NULLIF(trim(s.Username), ''), u.display_name, '') AS Username,
+                       COALESCE(NULLIF(s.Category, ''), 'flower') AS Category,
+                       COALESCE(NULLIF(s.Producer, ''), 'Unknown') AS Producer,
+                       substr(s.Date_Added, 1, 10) AS Date_Added_Short
+                FROM submissions s
+                LEFT JOIN users u ON u.id = s.User_ID_Clean AND u.updated_at >= ?
+                ORDER BY s.Date_Added DESC, s.rowid
+                LIMIT ?
+                """,
+                (time.time() - self.user_ttl, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def _select_ratings(self, where: str, params: Dict[str, Any], limit: int, missing: str) -> List[Dict]:
+        """Ratings newest first, joined with their strain and with the display username resolved"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT r.Rating_ID, r.Unique_ID, r.User_ID_Clean, r.Rating, r.Date_Rated, r.Username,
+                       substr(r.Date_Rated, 1, 10) AS Date_Rated_Short,
+                       COALESCE(NULLIF(trim(r.Username), ''), u.display_name, 'User-' || r.User_ID_Clean) AS Username_Display,
+                       COALESCE(s.Strain_Name, 'Unknown') AS Strain_Name,
+                       COALESCE(s.Harvest_Date, :missing) AS Harvest_Date,
+                       COALESCE(s.Package_Date, :missing) AS Package_Date,
+                       COALESCE(s.Category, 'flower') AS Category,
+                       COALESCE(s.Producer, 'Unknown') AS Producer,
+                       s.Status AS Status
+                FROM ratings r
+                LEFT JOIN strains s ON s.Unique_ID = r.Unique_ID
+                LEFT JOIN users u ON u.id = r.User_ID_Clean AND u.updated_at >= :fresh
+                {where}
+                ORDER BY r.Date_Rated DESC, r.rowid
+                LIMIT :limit
+                """,
+                {**params, 'missing': missing, 'fresh': time.time() - self.user_ttl, 'limit': limit}
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def last_ratings(self, limit: int = 10, approved_only: bool = False, missing: str = 'Unknown') -> List[Dict]:
+        """Newest ratings - with approved_only, ratings of unapproved strains are dropped from those newest ones"""
+        ratings = self._select_ratings("", {}, limit, missing)
+        if approved_only:
+            ratings = [rating for rating in ratings if rating['Status'] == 'Approved']
+        return ratings
+    
+    def ratings_for_strain(self, unique_id: str, limit: int = 5) -> List[Dict]:
+        """Newest ratings of one strain (indexed on Unique_ID, Date_Rated)"""
+        return self._select_ratings("WHERE r.Unique_ID = :unique_id", {'unique_id': str(unique_id)}, limit, 'N/A')
+    
+    def get_strain(self, identifier: str, category: Optional[str] = None) -> Optional[Dict]:
+        """Exact lookup by unique ID (primary key) then by case insensitive name (indexed)"""
+        category_sql = " AND lower(Category) = ?" if category else ""
+        category_params = (category.lower(),) if category else ()
+        
+        with self._lock:
+            row = None
+            if _UNIQUE_ID_RE.match(identifier):
+                row = self._conn.execute(
+                    f"SELECT * FROM strains WHERE Unique_ID = ?{category_sql}",
+                    (identifier.upper(), *category_params)
+                ).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    f"SELECT * FROM strains WHERE Strain_Name = ? COLLATE NOCASE{category_sql} ORDER BY rowid LIMIT 1",
+                    (identifier, *category_params)
+                ).fetchone()
+        return dict(row) if row else None
+    
+    def top_approved_strains(self, category: Optional[str] = None, limit: int = 15) -> Tuple[List[Dict], int]:
+        """Top approved strains by average rating (unrated last) plus the total approved count"""
+        where = "Status = 'Approved'"
+        params: List[Any] = []
+        if category:
+            where += " AND lower(Category) = ?"
+            params.append(category.lower())
+        
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM strains WHERE {where} "
+                "ORDER BY CASE WHEN Total_Ratings > 0 THEN Average_Rating ELSE -1 END DESC, rowid LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+            total = self._conn.execute(f"SELECT COUNT(*) FROM strains WHERE {where}", params).fetchone()[0]
+        return [dict(row) for row in rows], total
+    
+    def search_strains(self, query: Union[str, Pattern], category: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        """Search strains by name or unique ID - a compiled pattern is matched as-is, a plain string is a case insensitive substring"""
+        where = []
+        params: List[Any] = []
+        if category:
+            where.append("lower(Category) = ?")
+            params.append(category.lower())
+        
+        if isinstance(query, re.Pattern):
+            # Wildcard search - filter with the precompiled pattern
+            sql = "SELECT * FROM strains"
+            if where:
+                sql += f" WHERE {' AND '.join(where)}"
+            with self._lock:
+                rows = self._conn.execute(sql + " ORDER BY rowid", params).fetchall()
+            
+            matches = []
+            for row in rows:
+                if query.match(str(row['Strain_Name'])) or query.match(row['Unique_ID']):
+                    matches.append(dict(row))
+                    if len(matches) >= limit:
+                        break
+            return matches
+        
+        # Partial matching
+        query_lower = query.lower()
+        where.append("(instr(lower(Strain_Name), ?) > 0 OR instr(lower(Unique_ID), ?) > 0)")
+        params.extend((query_lower, query_lower, limit))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM strains WHERE {' AND '.join(where)} ORDER BY rowid LIMIT ?", params
+            ).fetchall()
+        return [dict(row) for row in rows]
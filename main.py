@@ -3,20 +3,81 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+import calendar
+from collections import Counter
+import contextlib
+import fnmatch
+import json
 import logging
-from datetime import datetime
+import re
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
 # Import our custom modules
 from config import Config
 from validators import InputValidator
 from rate_limiter import AdvancedRateLimiter
-from monitoring import setup_logging, HealthMonitor
+from monitoring import setup_logging, flush_logging, stop_logging, HealthMonitor
 from enhanced_sheets import OptimizedSheetsManager
+from stats_store import CommandStatsStore
 
 # Initialize logging first
 logger = setup_logging(Config.LOG_LEVEL)
 
+# Star strings for ratings 0-10, indexed by rating
+STAR_STRINGS = tuple("⭐" * i for i in range(11))
+
+# Category display data - the single source for the bot's lookups and the per-row tables below
+CATEGORY_EMOJIS = {"flower": "🌿", "hash": "🍯", "rosin": "🧈"}
+CATEGORY_NAMES = {"flower": "Flower", "hash": "Hash", "rosin": "Rosin"}
+
+# Per-category display tables indexed by CAT_ID (unknown categories fall back to flower)
+CAT_ID = {category: i for i, category in enumerate(CATEGORY_NAMES)}
+CAT_EMOJI = tuple(CATEGORY_EMOJIS[category] for category in CAT_ID)
+CAT_NAME = tuple(CATEGORY_NAMES[category] for category in CAT_ID)
+
+# Placeholder status embeds, cloned with discord.Embed.from_dict when messages are (re)created
+_TOP_TEMPLATE = {
+    "description": "Loading product data...",
+    "color": discord.Color.gold().value,
+    "footer": {"text": "Updates automatically when new ratings are added"}
+}
+_RATINGS_TEMPLATE = {
+    "title": "⭐ Recent Ratings",
+    "description": "Loading recent activity...",
+    "color": discord.Color.blue().value,
+    "footer": {"text": "Shows the last 10 ratings • Updates automatically"}
+}
+_SUBMISSIONS_TEMPLATE = {
+    "title": "📋 Recent Submissions",
+    "description": "Loading recent submissions...",
+    "color": discord.Color.purple().value,
+    "footer": {"text": "Shows the last 10 submissions • Updates automatically"}
+}
+
+# Titles of the bot's status messages (used by the history-scan fallback)
+STATUS_TITLE_RE = re.compile(r"🏆 Top 10|⭐ Recent Ratings|📋 Recent Submissions|Top 10 (?:Flower|Hash|Rosin)")
+
+# DD-MM-YYYY date input format
+_DD_MM_YYYY = re.compile(r'([0-9]{2})-([0-9]{2})-([0-9]{4})')
+
+# User-facing replies for expected app command errors, keyed by exact error type
+_ERROR_MAP = {
+    app_commands.CommandOnCooldown: lambda e: f"⏰ Command is on cooldown. Try again in {e.retry_after:.1f} seconds.",
+    app_commands.MissingPermissions: lambda e: "❌ You don't have permission to use this command.",
+}
+
+async def _defer_with_fetch(interaction: discord.Interaction, fetch: asyncio.Task):
+    """Defer an ephemeral response while a lookup task runs, cancelling the task if the defer fails"""
+    try:
+        await interaction.response.defer(ephemeral=True)
+    except BaseException:
+        # Nothing will await the lookup - stop it and retrieve its outcome so an exception
+        # (including one raised before the cancel) isn't reported as never retrieved
+        fetch.cancel()
+        fetch.add_done_callback(lambda task: task.cancelled() or task.exception())
+        raise
+
 class ProducerSelect(discord.ui.Select):
     """Producer selection dropdown for strain submission"""
     def __init__(self, valid_producers: List[str]):
@@ -53,8 +114,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
         self.producer = producer
         
         # Update title based on category
-        category_names = {"flower": "Flower", "hash": "Hash", "rosin": "Rosin"}
-        self.title = f'Submit New {category_names.get(category, "Product")}'
+        self.title = f'Submit New {CATEGORY_NAMES.get(category, "Product")}'
     
     strain_name = discord.ui.TextInput(
         label='Product Name',
@@ -88,7 +148,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
             return
         
         # Rate limiting check
-        if not await bot.rate_limiter.check_user_limit(
+        if not bot.rate_limiter.check_user_limit(
             interaction.user.id, 
             Config.RATE_LIMIT_PER_USER, 
             Config.RATE_LIMIT_WINDOW
@@ -99,7 +159,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
                 )
             except Exception as e:
                 logger.error(f"Failed to send rate limit message: {e}")
-            await bot.log_command_usage(interaction, 'submit_strain', success=False)
+            bot.log_command_usage(interaction, 'submit_strain', success=False)
             return
         
         try:
@@ -109,7 +169,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
                 await interaction.edit_original_response(
                     content="❌ Invalid product name. Please use 2-50 characters with letters, numbers, spaces, and basic punctuation only."
                 )
-                await bot.log_command_usage(interaction, 'submit_strain', success=False)
+                bot.log_command_usage(interaction, 'submit_strain', success=False)
                 return
             
             # Validate dates in DD-MM-YYYY format
@@ -120,7 +180,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
                 await interaction.edit_original_response(
                     content="❌ Invalid date format. Please use DD-MM-YYYY (e.g., 01-12-2024)."
                 )
-                await bot.log_command_usage(interaction, 'submit_strain', success=False)
+                bot.log_command_usage(interaction, 'submit_strain', success=False)
                 return
             
             # Check for duplicate strain with enhanced detection (including category and producer)
@@ -135,7 +195,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
                            f"**Existing product ID:** `{existing_unique_id}`\n"
                            f"Use this ID to reference the existing product, or submit with different dates if this is a different batch."
                 )
-                await bot.log_command_usage(interaction, 'submit_strain', success=False)
+                bot.log_command_usage(interaction, 'submit_strain', success=False)
                 return
             
             # Get user display name
@@ -148,8 +208,8 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
             
             if unique_id:
                 # Create success embed
-                category_emojis = {"flower": "🌿", "hash": "🍯", "rosin": "🧈"}
-                category_names = {"flower": "Flower", "hash": "Hash", "rosin": "Rosin"}
+                category_emojis = CATEGORY_EMOJIS
+                category_names = CATEGORY_NAMES
                 
                 embed = discord.Embed(
                     title=f"✅ {category_names[self.category]} Submitted Successfully",
@@ -183,7 +243,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
                         logger.error(f"Fallback response also failed: {fallback_error}")
                         return
                 
-                await bot.log_command_usage(interaction, 'submit_strain', success=True)
+                bot.log_command_usage(interaction, 'submit_strain', success=True)
                 
                 # Check for moderator notification
                 try:
@@ -195,7 +255,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
                 await interaction.edit_original_response(
                     content="❌ Failed to submit product. Please check your inputs and try again."
                 )
-                await bot.log_command_usage(interaction, 'submit_strain', success=False)
+                bot.log_command_usage(interaction, 'submit_strain', success=False)
         
         except Exception as e:
             logger.error(f"Error in strain submission modal: {e}", exc_info=True)
@@ -205,7 +265,7 @@ class StrainSubmissionModal(discord.ui.Modal, title='Submit New Product'):
                 )
             except Exception as edit_error:
                 logger.error(f"Failed to send error message: {edit_error}")
-            await bot.log_command_usage(interaction, 'submit_strain', success=False)
+            bot.log_command_usage(interaction, 'submit_strain', success=False)
 
 class CategoryProducerSelectView(discord.ui.View):
     """View for category and producer selection before submission"""
@@ -297,7 +357,8 @@ class PendingApprovalView(discord.ui.View):
                 category = strain.get('Category', 'flower')
                 
                 # Approve the strain
-                success = await self.bot.sheets_manager.approve_strain(unique_id)
+                result = await self.bot.sheets_manager.approve_strain(unique_id)
+                success = result is not None and result[0]
                 
                 if success:
                     # Mark as approved
@@ -316,19 +377,19 @@ class PendingApprovalView(discord.ui.View):
                     await interaction.response.edit_message(embed=embed, view=self)
                     
                     # Log the approval
-                    await self.bot.log_command_usage(interaction, 'approve_strain', success=True)
+                    self.bot.log_command_usage(interaction, 'approve_strain', success=True)
                     
                     # Update status messages after approval
                     await self.bot.update_status_messages()
                     
                 else:
                     await interaction.response.send_message("❌ Failed to approve product. Please try again.", ephemeral=True)
-                    await self.bot.log_command_usage(interaction, 'approve_strain', success=False)
+                    self.bot.log_command_usage(interaction, 'approve_strain', success=False)
                     
             except Exception as e:
                 logger.error(f"Error in approval callback: {e}", exc_info=True)
                 await interaction.response.send_message("❌ An error occurred while approving the product.", ephemeral=True)
-                await self.bot.log_command_usage(interaction, 'approve_strain', success=False)
+                self.bot.log_command_usage(interaction, 'approve_strain', success=False)
         
         return approval_callback
     
@@ -348,12 +409,11 @@ class PendingApprovalView(discord.ui.View):
                 
                 # Show summary of approved strains
                 for i, strain in enumerate(self.pending_strains[:9], 1):
-                    category = strain.get('Category', 'flower')
-                    category_emojis = {"flower": "🌿", "hash": "🍯", "rosin": "🧈"}
+                    cid = CAT_ID.get(strain.get('Category', 'flower'), 0)
                     producer = strain.get('Producer', 'Unknown')
                     
                     embed.add_field(
-                        name=f"{i}. {category_emojis.get(category, '🌿')} {strain['Strain_Name']}",
+                        name=f"{i}. {CAT_EMOJI[cid]} {strain['Strain_Name']}",
                         value=f"ID: `{strain.get('Unique_ID', 'N/A')}`\nProducer: {producer}\n✅ **Approved**",
                         inline=True
                     )
@@ -376,13 +436,12 @@ class PendingApprovalView(discord.ui.View):
                     index = i - 1  # Convert to 0-based index
                     is_approved = index in self.approved_indices
                     status = "✅ **Approved**" if is_approved else "⏳ **Pending**"
-                    category = strain.get('Category', 'flower')
-                    category_emojis = {"flower": "🌿", "hash": "🍯", "rosin": "🧈"}
+                    cid = CAT_ID.get(strain.get('Category', 'flower'), 0)
                     producer = strain.get('Producer', 'Unknown')
                     
                     embed.add_field(
-                        name=f"{i}. {category_emojis.get(category, '🌿')} {strain['Strain_Name']}",
-                        value=f"ID: `{strain.get('Unique_ID', 'N/A')}`\nCategory: {self.bot.category_names.get(category, 'Flower')}\nProducer: {producer}\nHarvest: {strain.get('Harvest_Date', 'N/A')}\nPackage: {strain.get('Package_Date', 'N/A')}\nStatus: {status}",
+                        name=f"{i}. {CAT_EMOJI[cid]} {strain['Strain_Name']}",
+                        value=f"ID: `{strain.get('Unique_ID', 'N/A')}`\nCategory: {CAT_NAME[cid]}\nProducer: {producer}\nHarvest: {strain.get('Harvest_Date', 'N/A')}\nPackage: {strain.get('Package_Date', 'N/A')}\nStatus: {status}",
                         inline=True
                     )
                 
@@ -429,15 +488,19 @@ class EnhancedStrainBot(commands.Bot):
         self.validator = InputValidator()
         
         # Categories
-        self.valid_categories = ['flower', 'hash', 'rosin']
-        self.category_emojis = {"flower": "🌿", "hash": "🍯", "rosin": "🧈"}
-        self.category_names = {"flower": "Flower", "hash": "Hash", "rosin": "Rosin"}
+        self.valid_categories = list(CATEGORY_NAMES)
+        self.category_emojis = CATEGORY_EMOJIS
+        self.category_names = CATEGORY_NAMES
         
         # Producers - will be loaded from Google Sheets on startup
         self.valid_producers = []  # Empty initially, loaded from sheets
+        self._producers_joined = ""  # Cached ", ".join(valid_producers)
+        self._valid_producers_set = frozenset()  # O(1) membership checks
+        self._producers_rev = 0  # Bumped whenever the producer list changes
+        self._producers_embed_cache: Optional[tuple] = None  # (revision, list_producers embed)
         
         # Statistics tracking
-        self.command_stats = {
+        self.command_stats = Counter({
             'submit_strain': 0,
             'rate_strain': 0,
             'view_strain': 0,
@@ -453,11 +516,35 @@ class EnhancedStrainBot(commands.Bot):
             'add_producer': 0,
             'remove_producer': 0,  # NEW command
             'list_producers': 0
-        }
+        })
+        
+        # Command usage persisted locally so the counters survive restarts
+        self.stats_store = CommandStatsStore(Config.STATS_DB_PATH)
+        for command_name, count in self.stats_store.load_counts().items():
+            if command_name in self.command_stats:
+                self.command_stats[command_name] = count
+        self.stats_flush_interval = 60
+        self._stats_flush_task: Optional[asyncio.Task] = None
+        
+        # Periodic flush of the buffered log file
+        self.log_flush_interval = 30
+        self._log_flush_task: Optional[asyncio.Task] = None
+        
+        # Moderator roles - resolved per guild once the bot is ready
+        moderator_role_ids = getattr(Config, 'MODERATOR_ROLE_IDS', [Config.MODERATOR_ROLE_ID])
+        if not isinstance(moderator_role_ids, list):
+            moderator_role_ids = [moderator_role_ids]
+        self._mod_role_ids = frozenset(role_id for role_id in moderator_role_ids if role_id)
+        self._mod_roles: Dict[int, discord.Role] = {}  # {role_id: role}
+        self._min_mod_position: Dict[int, int] = {}  # {guild_id: lowest moderator role position}
         
         # Moderator notification tracking
         self.last_moderator_notification = 0
         self.notification_cooldown = 3600  # 1 hour cooldown
+        self.mod_alert_lifetime = 1800  # Alerts are removed after 30 minutes
+        self._mod_alert_message: Optional[discord.Message] = None
+        self._mod_alert_expires_at = 0
+        self._mod_alert_sweep_task: Optional[asyncio.Task] = None
         
         # Persistent status messages (one for each category + recent submissions)
         self.status_channel = None
@@ -465,6 +552,30 @@ class EnhancedStrainBot(commands.Bot):
         self.recent_ratings_message = None
         self.recent_submissions_message = None  # NEW: for last submissions
         self.status_update_lock = asyncio.Lock()
+        
+        # Bounded concurrency for message edits/sends issued by the bot itself
+        self._discord_sem = asyncio.Semaphore(5)
+    
+    async def _rate_limited(self, call, *args, **kwargs):
+        """Run a Discord API call under the shared semaphore, retrying once on 429"""
+        async with self._discord_sem:
+            try:
+                return await call(*args, **kwargs)
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    raise
+                retry_after = float(e.response.headers.get('Retry-After', 1))
+                logger.warning(f"Rate limited by Discord, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+                return await call(*args, **kwargs)
+    
+    async def _do_edit(self, msg: discord.Message, **kwargs) -> discord.Message:
+        """Edit a message through the rate-limit-aware scheduler"""
+        return await self._rate_limited(msg.edit, **kwargs)
+    
+    async def _do_send(self, channel: discord.abc.Messageable, *args, **kwargs) -> discord.Message:
+        """Send a message through the rate-limit-aware scheduler"""
+        return await self._rate_limited(channel.send, *args, **kwargs)
     
     def get_user_display_name(self, user) -> str:
         """Get the best display name with explicit fallback handling"""
@@ -523,12 +634,35 @@ class EnhancedStrainBot(commands.Bot):
         # Tertiary: Generic fallback with partial ID
         return f"Former Member ({str(user_id)[-4:]})"
     
+    async def resolve_display_names(self, user_ids) -> Dict[int, str]:
+        """Resolve several user IDs at once, fetching names not yet in the local index concurrently"""
+        user_ids = set(user_ids)
+        names = self.sheets_manager.index.get_display_names(user_ids)
+        missing = [user_id for user_id in user_ids if user_id not in names]
+        
+        if missing:
+            resolved = dict(zip(missing, await asyncio.gather(
+                *(self.resolve_user_display_name(user_id) for user_id in missing)
+            )))
+            # Stored names are joined into later submission queries
+            self.sheets_manager.index.store_display_names(resolved)
+            names.update(resolved)
+        
+        return names
+    
     async def setup_hook(self):
         """Called when bot is starting up"""
         try:
             # Start health monitoring server
             await self.health_monitor.start_health_server(Config.HEALTH_CHECK_PORT)
             
+            # Single background sweep for expired moderator alerts
+            self._mod_alert_sweep_task = asyncio.create_task(self._mod_alert_sweeper())
+            
+            # Periodic batch write of buffered command stats
+            self._stats_flush_task = asyncio.create_task(self._stats_flusher())
+            self._log_flush_task = asyncio.create_task(self._log_flusher())
+            
             # Sync commands for testing guild
             if Config.GUILD_ID:
                 guild = discord.Object(id=Config.GUILD_ID)
@@ -545,33 +679,131 @@ class EnhancedStrainBot(commands.Bot):
         logger.info(f'{self.user} has connected to Discord!')
         logger.info(f'Bot is in {len(self.guilds)} guilds')
         
+        # Resolve moderator roles once instead of on every permission check
+        for guild in self.guilds:
+            self._cache_moderator_roles(guild)
+        
         # Load valid producers from Google Sheets
         await self.load_producers()
         
+        # Mirror strain data into the local index for fast reads
+        await self.sheets_manager.refresh_index()
+        
+        self.health_monitor.update_metrics()
+        
         # Setup persistent status messages
         await self.setup_status_messages()
     
+    def _cache_moderator_roles(self, guild: discord.Guild):
+        """Cache the moderator Role objects and lowest moderator position for a guild"""
+        self._mod_roles = {
+            role_id: role for role_id, role in self._mod_roles.items()
+            if role.guild.id != guild.id
+        }
+        guild_roles = {role.id: role for role in guild.roles if role.id in self._mod_role_ids}
+        self._mod_roles.update(guild_roles)
+        
+        if guild_roles:
+            self._min_mod_position[guild.id] = min(role.position for role in guild_roles.values())
+        else:
+            self._min_mod_position.pop(guild.id, None)
+    
+    async def on_guild_join(self, guild: discord.Guild):
+        self._cache_moderator_roles(guild)
+        self.health_monitor.update_metrics()
+    
+    async def on_guild_role_create(self, role: discord.Role):
+        self._cache_moderator_roles(role.guild)
+    
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._cache_moderator_roles(after.guild)
+    
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._cache_moderator_roles(role.guild)
+    
+    def _set_producers(self, producers: List[str]):
+        """Replace the producer list and refresh values derived from it"""
+        self.valid_producers = producers
+        self._producers_joined = ", ".join(producers)
+        self._valid_producers_set = frozenset(producers)
+        self._producers_rev += 1
+    
     async def load_producers(self):
         """Load valid producers from Google Sheets"""
         try:
             producers = await self.sheets_manager.get_all_producers()
             if producers:
-                self.valid_producers = producers
-                logger.info(f"Loaded {len(producers)} producers from Google Sheets: {', '.join(producers)}")
+                self._set_producers(producers)
+                logger.info(f"Loaded {len(producers)} producers from Google Sheets: {self._producers_joined}")
             else:
                 # Fallback to defaults if sheets loading fails
-                self.valid_producers = [
+                self._set_producers([
                     "Hollandse Hoogtes", "Q-Farms", "Fyta", 
                     "Aardachtig", "Canadelaar", "Holigram"
-                ]
+                ])
                 logger.warning("Failed to load producers from sheets, using defaults")
         except Exception as e:
             logger.error(f"Error loading producers: {e}")
             # Fallback to defaults
-            self.valid_producers = [
+            self._set_producers([
                 "Hollandse Hoogtes", "Q-Farms", "Fyta", 
                 "Aardachtig", "Canadelaar", "Holigram"
-            ]
+            ])
+    
+    def _status_message_refs(self) -> Dict[str, discord.Message]:
+        """Current status messages keyed by their slot name"""
+        refs = dict(self.top_strains_messages)
+        if self.recent_ratings_message:
+            refs['recent_ratings'] = self.recent_ratings_message
+        if self.recent_submissions_message:
+            refs['recent_submissions'] = self.recent_submissions_message
+        return refs
+    
+    def _save_status_message_ids(self):
+        """Persist status message IDs so restarts can fetch them directly"""
+        state = {
+            'channel_id': self.status_channel.id,
+            'messages': {key: message.id for key, message in self._status_message_refs().items()}
+        }
+        try:
+            with open(Config.STATUS_STATE_PATH, 'w') as f:
+                json.dump(state, f)
+        except OSError as e:
+            logger.warning(f"Could not save status message IDs: {e}")
+    
+    def _load_status_message_ids(self) -> Dict[str, Any]:
+        """Load persisted status message IDs"""
+        try:
+            with open(Config.STATUS_STATE_PATH) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load status message IDs: {e}")
+            return {}
+    
+    async def _restore_status_messages(self) -> bool:
+        """Fetch tracked status messages concurrently - returns False when nothing is tracked for this channel"""
+        state = self._load_status_message_ids()
+        tracked = state.get('messages') or {}
+        if state.get('channel_id') != self.status_channel.id or not tracked:
+            return False
+        
+        keys = list(tracked)
+        results = await asyncio.gather(
+            *(self.status_channel.fetch_message(int(tracked[key])) for key in keys),
+            return_exceptions=True
+        )
+        for key, result in zip(keys, results):
+            if not isinstance(result, discord.Message):
+                logger.info(f"Tracked status message '{key}' is no longer available: {result}")
+            elif key == 'recent_ratings':
+                self.recent_ratings_message = result
+            elif key == 'recent_submissions':
+                self.recent_submissions_message = result
+            elif key in self.valid_categories:
+                self.top_strains_messages[key] = result
+        return True
     
     async def setup_status_messages(self):
         """Setup persistent status messages in the designated channel"""
@@ -585,52 +817,40 @@ class EnhancedStrainBot(commands.Bot):
                 logger.warning(f"Could not find status channel with ID {Config.STATUS_CHANNEL_ID}")
                 return
             
-            # Look for existing status messages
-            async for message in self.status_channel.history(limit=100):
-                if message.author == self.user and message.embeds:
-                    title = message.embeds[0].title
-                    if "🏆 Top 10" in title:
-                        if "Flower" in title:
-                            self.top_strains_messages["flower"] = message
-                        elif "Hash" in title:
-                            self.top_strains_messages["hash"] = message
-                        elif "Rosin" in title:
-                            self.top_strains_messages["rosin"] = message
-                    elif title == "⭐ Recent Ratings":
-                        self.recent_ratings_message = message
-                    elif title == "📋 Recent Submissions":  # NEW
-                        self.recent_submissions_message = message
+            # Fetch tracked status messages by ID, scanning history only when nothing is tracked
+            if not await self._restore_status_messages():
+                async for message in self.status_channel.history(limit=100):
+                    if message.author == self.user and message.embeds:
+                        title = message.embeds[0].title
+                        if "🏆 Top 10" in title:
+                            if "Flower" in title:
+                                self.top_strains_messages["flower"] = message
+                            elif "Hash" in title:
+                                self.top_strains_messages["hash"] = message
+                            elif "Rosin" in title:
+                                self.top_strains_messages["rosin"] = message
+                        elif title == "⭐ Recent Ratings":
+                            self.recent_ratings_message = message
+                        elif title == "📋 Recent Submissions":  # NEW
+                            self.recent_submissions_message = message
             
             # Create initial status messages if they don't exist
             for category in self.valid_categories:
                 if category not in self.top_strains_messages:
-                    embed = discord.Embed(
-                        title=f"🏆 Top 10 {self.category_names[category]} Products",
-                        description="Loading product data...",
-                        color=discord.Color.gold()
-                    )
-                    embed.set_footer(text="Updates automatically when new ratings are added")
+                    embed = discord.Embed.from_dict({**_TOP_TEMPLATE, "title": f"🏆 Top 10 {self.category_names[category]} Products"})
                     self.top_strains_messages[category] = await self.status_channel.send(embed=embed)
             
             if not self.recent_ratings_message:
-                embed = discord.Embed(
-                    title="⭐ Recent Ratings",
-                    description="Loading recent activity...",
-                    color=discord.Color.blue()
-                )
-                embed.set_footer(text="Shows the last 10 ratings • Updates automatically")
+                embed = discord.Embed.from_dict(_RATINGS_TEMPLATE)
                 self.recent_ratings_message = await self.status_channel.send(embed=embed)
             
             # NEW: Create recent submissions message
             if not self.recent_submissions_message:
-                embed = discord.Embed(
-                    title="📋 Recent Submissions",
-                    description="Loading recent submissions...",
-                    color=discord.Color.purple()
-                )
-                embed.set_footer(text="Shows the last 10 submissions • Updates automatically")
+                embed = discord.Embed.from_dict(_SUBMISSIONS_TEMPLATE)
                 self.recent_submissions_message = await self.status_channel.send(embed=embed)
             
+            self._save_status_message_ids()
+            
             # Update with current data
             await self.update_status_messages()
             
@@ -646,30 +866,34 @@ class EnhancedStrainBot(commands.Bot):
         
         async with self.status_update_lock:
             try:
+                # Single timestamp shared by every section of this refresh
+                now = discord.utils.utcnow()
+                
                 # Update top strains messages for each category
                 for category in self.valid_categories:
                     if category in self.top_strains_messages:
                         top_strains = await self.sheets_manager.get_top_strains_for_status(category, 10)
+                        cat_label = self.category_names[category]
                         
                         top_embed = discord.Embed(
-                            title=f"🏆 Top 10 {self.category_names[category]} Products",
+                            title=f"🏆 Top 10 {cat_label} Products",
                             color=discord.Color.gold(),
-                            timestamp=datetime.utcnow()
+                            timestamp=now
                         )
                         
                         if top_strains:
                             strain_list = []
+                            stars = STAR_STRINGS
                             for i, strain in enumerate(top_strains, 1):
                                 harvest_date = strain.get('Harvest_Date', 'N/A')
                                 package_date = strain.get('Package_Date', 'N/A')
                                 producer = strain.get('Producer', 'Unknown')
-                                rating = float(strain.get('Average_Rating', 0))
-                                # Create star emoji representation (round to nearest whole number for display)
-                                star_count = round(rating)
-                                rating_stars = "⭐" * star_count
+                                avg_rating = strain['Average_Rating']
+                                # Star emoji representation (rounded to nearest whole number for display)
+                                rating_stars = stars[max(0, min(round(avg_rating), 10))]
                                 
                                 strain_list.append(
-                                    f"**{i}.** {strain['Strain_Name']} - {strain['Average_Rating']}/10 {rating_stars}\n"
+                                    f"**{i}.** {strain['Strain_Name']} - {avg_rating}/10 {rating_stars}\n"
                                     f"     `{strain.get('Unique_ID', 'N/A')}` • {strain['Total_Ratings']} ratings • {producer}\n"
                                     f"     Harvest: {harvest_date} • Package: {package_date}"
                                 )
@@ -678,7 +902,7 @@ class EnhancedStrainBot(commands.Bot):
                             top_embed.description = f"No rated {category} products yet. Be the first to rate!"
                         
                         top_embed.set_footer(text="Updates automatically when new ratings are added")
-                        await self.top_strains_messages[category].edit(embed=top_embed)
+                        await self._do_edit(self.top_strains_messages[category], embed=top_embed)
                 
                 # Update recent ratings message with usernames and categories
                 if self.recent_ratings_message:
@@ -687,34 +911,36 @@ class EnhancedStrainBot(commands.Bot):
                     ratings_embed = discord.Embed(
                         title="⭐ Recent Ratings",
                         color=discord.Color.blue(),
-                        timestamp=datetime.utcnow()
+                        timestamp=now
                     )
                     
                     if recent_ratings:
-                        ratings_list = []
+                        parts = []
+                        stars = STAR_STRINGS
                         for rating in recent_ratings:
-                            rating_stars = "⭐" * int(rating.get('Rating', 0))
-                            date_str = rating.get('Date_Rated', 'Unknown')[:10]  # Just the date part
+                            rating_value = rating['Rating']
+                            rating_stars = stars[max(0, min(rating_value, 10))]
+                            date_str = rating['Date_Rated_Short']
                             harvest_date = rating.get('Harvest_Date', 'N/A')
                             package_date = rating.get('Package_Date', 'N/A')
-                            category = rating.get('Category', 'flower')
                             producer = rating.get('Producer', 'Unknown')
                             
                             # Use stored username from the database (already handled by sheets manager)
                             username = rating.get('Username_Display', 'Unknown User')
-                            category_emoji = self.category_emojis.get(category, '🌿')
+                            category_emoji = CAT_EMOJI[CAT_ID.get(rating.get('Category', 'flower'), 0)]
                             
-                            ratings_list.append(
-                                f"{category_emoji} **{rating.get('Strain_Name', 'Unknown')}** - {rating.get('Rating', 'N/A')}/10 {rating_stars}\n"
-                                f"     By: {username} • {date_str} • {producer}\n"
-                                f"     Harvest: {harvest_date} • Package: {package_date}"
-                            )
-                        ratings_embed.description = "\n\n".join(ratings_list)
+                            parts.extend((
+                                f"{category_emoji} **{rating.get('Strain_Name', 'Unknown')}** - {rating_value}/10 {rating_stars}",
+                                f"     By: {username} • {date_str} • {producer}",
+                                f"     Harvest: {harvest_date} • Package: {package_date}",
+                                ""
+                            ))
+                        ratings_embed.description = "\n".join(parts).rstrip()
                     else:
                         ratings_embed.description = "No ratings yet. Submit `/rate_strain` to get started!"
                     
                     ratings_embed.set_footer(text="Shows the last 10 ratings • Updates automatically")
-                    await self.recent_ratings_message.edit(embed=ratings_embed)
+                    await self._do_edit(self.recent_ratings_message, embed=ratings_embed)
                 
                 # NEW: Update recent submissions message
                 if self.recent_submissions_message:
@@ -723,33 +949,36 @@ class EnhancedStrainBot(commands.Bot):
                     submissions_embed = discord.Embed(
                         title="📋 Recent Submissions",
                         color=discord.Color.purple(),
-                        timestamp=datetime.utcnow()
+                        timestamp=now
                     )
                     
                     if recent_submissions:
-                        submissions_list = []
+                        # Resolve missing usernames in one concurrent batch
+                        resolved_names = await self.resolve_display_names(
+                            s.get('User_ID_Clean', 0) for s in recent_submissions if not s.get('Username', '').strip()
+                        )
+                        parts = []
                         for submission in recent_submissions:
-                            category = submission.get('Category', 'flower')
-                            category_emoji = self.category_emojis.get(category, '🌿')
+                            category_emoji = CAT_EMOJI[CAT_ID.get(submission.get('Category', 'flower'), 0)]
                             producer = submission.get('Producer', 'Unknown')
-                            date_str = submission.get('Date_Added', 'Unknown')[:10]  # Just the date part
+                            date_str = submission['Date_Added_Short']
                             
-                            # Use stored username from database or resolve from Discord
-                            user_id = submission.get('User_ID_Clean', 0)
+                            # Use stored username from database or the resolved Discord name
                             stored_username = submission.get('Username', '').strip()
-                            username = stored_username if stored_username else await self.resolve_user_display_name(user_id)
+                            username = stored_username or resolved_names[submission.get('User_ID_Clean', 0)]
                             
-                            submissions_list.append(
-                                f"{category_emoji} **{submission.get('Strain_Name', 'Unknown')}**\n"
-                                f"     By: {username} • {date_str} • {producer}\n"
-                                f"     ID: `{submission.get('Unique_ID', 'N/A')}`"
-                            )
-                        submissions_embed.description = "\n\n".join(submissions_list)
+                            parts.extend((
+                                f"{category_emoji} **{submission.get('Strain_Name', 'Unknown')}**",
+                                f"     By: {username} • {date_str} • {producer}",
+                                f"     ID: `{submission.get('Unique_ID', 'N/A')}`",
+                                ""
+                            ))
+                        submissions_embed.description = "\n".join(parts).rstrip()
                     else:
                         submissions_embed.description = "No submissions yet. Submit `/submit_strain` to get started!"
                     
                     submissions_embed.set_footer(text="Shows the last 10 submissions • Updates automatically")
-                    await self.recent_submissions_message.edit(embed=submissions_embed)
+                    await self._do_edit(self.recent_submissions_message, embed=submissions_embed)
                 
                 logger.debug("Status messages updated successfully")
                 
@@ -761,41 +990,30 @@ class EnhancedStrainBot(commands.Bot):
         if not user or not user.roles:
             return False
         
-        user_roles = [role.id for role in user.roles]
-        user_highest_position = max(role.position for role in user.roles)
-        
-        # Check if user has any of the specified moderator roles
-        moderator_role_ids = getattr(Config, 'MODERATOR_ROLE_IDS', [Config.MODERATOR_ROLE_ID])
-        if not isinstance(moderator_role_ids, list):
-            moderator_role_ids = [moderator_role_ids]
-        
         # Direct role match
-        if any(role_id in user_roles for role_id in moderator_role_ids):
+        if not self._mod_role_ids.isdisjoint(role.id for role in user.roles):
             return True
         
         # Check hierarchical permissions if enabled
         if getattr(Config, 'HIERARCHICAL_PERMISSIONS', False):
-            # Find the position of the moderator role in the guild
-            moderator_role_positions = []
-            for role_id in moderator_role_ids:
-                role = discord.utils.get(user.guild.roles, id=role_id)
-                if role:
-                    moderator_role_positions.append(role.position)
-            
-            if moderator_role_positions:
-                min_moderator_position = min(moderator_role_positions)
+            min_moderator_position = self._min_mod_position.get(user.guild.id)
+            if min_moderator_position is not None:
+                user_highest_position = max(role.position for role in user.roles)
                 return user_highest_position >= min_moderator_position
         
         return False
     
-    async def log_command_usage(self, interaction: discord.Interaction, command_name: str, success: bool = True):
-        """Log command usage for monitoring"""
+    def log_command_usage(self, interaction: discord.Interaction, command_name: str, success: bool = True):
+        """Log command usage for monitoring (in-memory only - the stats store and log file are written in batches)"""
         if command_name in self.command_stats:
             self.command_stats[command_name] += 1
         
+        guild_id = interaction.guild.id if interaction.guild else None
+        self.stats_store.record(interaction.user.id, guild_id, command_name, success)
+        
         extra = {
             'user_id': interaction.user.id,
-            'guild_id': interaction.guild.id if interaction.guild else None,
+            'guild_id': guild_id,
             'command_name': command_name,
             'success': success
         }
@@ -805,51 +1023,96 @@ class EnhancedStrainBot(commands.Bot):
         else:
             logger.warning(f"Command failed: {command_name}", extra=extra)
     
-    async def check_and_notify_moderators(self, guild: discord.Guild):
-        """Check for pending strains and notify moderators if needed"""
+    def _build_mod_alert_embed(self, pending_count: int) -> discord.Embed:
+        """Build the moderator alert embed for the given pending count"""
+        embed = discord.Embed(
+            title="📋 Moderator Alert",
+            description=f"There {'is' if pending_count == 1 else 'are'} **{pending_count}** product{'s' if pending_count != 1 else ''} pending approval.",
+            color=discord.Color.orange()
+        )
+        embed.add_field(
+            name="Action Required",
+            value="Use `/pending_strains` to view and approve with buttons.",
+            inline=False
+        )
+        embed.set_footer(text="This notification appears once per hour when products are pending.")
+        return embed
+    
+    async def _delete_mod_alert(self):
+        """Delete the current moderator alert message, if any"""
+        msg = self._mod_alert_message
+        self._mod_alert_message = None
+        if msg:
+            try:
+                await msg.delete()
+            except discord.HTTPException:
+                pass
+    
+    async def _mod_alert_sweeper(self):
+        """Periodically remove expired moderator alerts"""
+        while True:
+            await asyncio.sleep(60)
+            try:
+                if self._mod_alert_message and datetime.now().timestamp() >= self._mod_alert_expires_at:
+                    await self._delete_mod_alert()
+            except Exception as e:
+                logger.error(f"Error sweeping moderator alert: {e}")
+    
+    async def _stats_flusher(self):
+        """Periodically write buffered command usage to the local stats database"""
+        while True:
+            await asyncio.sleep(self.stats_flush_interval)
+            try:
+                self.stats_store.flush()
+            except Exception as e:
+                logger.error(f"Error flushing command stats: {e}")
+    
+    async def _log_flusher(self):
+        """Periodically write buffered log records to the log file"""
+        while True:
+            await asyncio.sleep(self.log_flush_interval)
+            # File write happens off the event loop
+            await asyncio.to_thread(flush_logging)
+    
+    async def check_and_notify_moderators(self, guild: discord.Guild, pending_count: Optional[int] = None):
+        """Check for pending strains and notify moderators if needed (pending_count skips the fetch when the caller has it)"""
         try:
             current_time = datetime.now().timestamp()
+            alert_active = self._mod_alert_message is not None and current_time < self._mod_alert_expires_at
             
-            # Check cooldown
-            if current_time - self.last_moderator_notification < self.notification_cooldown:
+            # Check cooldown (a live alert is still kept up to date)
+            if not alert_active and current_time - self.last_moderator_notification < self.notification_cooldown:
                 return
             
             # Get pending count
-            pending_count = await self.sheets_manager.get_pending_strains_count()
+            if pending_count is None:
+                pending_count = await self.sheets_manager.get_pending_strains_count()
+            
+            # Refresh the live alert in place instead of sending a new one
+            if alert_active:
+                if pending_count > 0:
+                    try:
+                        await self._do_edit(self._mod_alert_message, embed=self._build_mod_alert_embed(pending_count))
+                    except discord.NotFound:
+                        self._mod_alert_message = None
+                else:
+                    await self._delete_mod_alert()
+                return
             
             if pending_count > 0:
                 # Find moderators - support multiple roles
-                moderator_role_ids = getattr(Config, 'MODERATOR_ROLE_IDS', [Config.MODERATOR_ROLE_ID])
-                if not isinstance(moderator_role_ids, list):
-                    moderator_role_ids = [moderator_role_ids]
-                
-                moderator_mentions = []
-                for role_id in moderator_role_ids:
-                    role = discord.utils.get(guild.roles, id=role_id)
-                    if role and role.members:
-                        moderator_mentions.append(role.mention)
+                moderator_mentions = [
+                    role.mention for role in self._mod_roles.values()
+                    if role.guild.id == guild.id and role.members
+                ]
                 
                 if moderator_mentions and self.status_channel:
-                    embed = discord.Embed(
-                        title="📋 Moderator Alert",
-                        description=f"There {'is' if pending_count == 1 else 'are'} **{pending_count}** product{'s' if pending_count != 1 else ''} pending approval.",
-                        color=discord.Color.orange()
-                    )
-                    embed.add_field(
-                        name="Action Required",
-                        value="Use `/pending_strains` to view and approve with buttons.",
-                        inline=False
-                    )
-                    embed.set_footer(text="This notification appears once per hour when products are pending.")
+                    embed = self._build_mod_alert_embed(pending_count)
                     
-                    # Send message and delete after 30 minutes
+                    # Send message; the sweep task deletes it once it expires
                     mentions_text = " ".join(moderator_mentions)
-                    msg = await self.status_channel.send(mentions_text, embed=embed)
-                    await asyncio.sleep(1800)  # 30 minutes
-                    try:
-                        await msg.delete()
-                    except:
-                        pass
+                    self._mod_alert_message = await self._do_send(self.status_channel, mentions_text, embed=embed)
+                    self._mod_alert_expires_at = current_time + self.mod_alert_lifetime
                     
                     self.last_moderator_notification = current_time
                     logger.info(f"Moderator notification sent for {pending_count} pending products")
@@ -864,11 +1127,12 @@ class EnhancedInputValidator(InputValidator):
     @staticmethod
     def validate_date_dd_mm_yyyy(date_str: str) -> bool:
         """Validate date format (DD-MM-YYYY)"""
-        try:
-            datetime.strptime(date_str, '%d-%m-%Y')
-            return True
-        except ValueError:
+        m = _DD_MM_YYYY.fullmatch(date_str)
+        if not m:
             return False
+        day, month, year = map(int, m.groups())
+        # Check the day against the actual month length (handles leap years)
+        return 1 <= month <= 12 and year >= 1 and 1 <= day <= calendar.monthrange(year, month)[1]
 
 # Update bot validator
 bot.validator = EnhancedInputValidator()
@@ -888,7 +1152,7 @@ async def submit_strain(interaction: discord.Interaction):
     embed.add_field(name="🧈 Rosin", value="Rosin products", inline=True)
     embed.add_field(
         name="📋 Available Producers", 
-        value=", ".join(bot.valid_producers), 
+        value=bot._producers_joined, 
         inline=False
     )
     embed.set_footer(text="Select a category and producer from the dropdowns below")
@@ -915,47 +1179,44 @@ async def rate_strain(
     """Rate product with enhanced identifier support and category filtering"""
     
     # Rate limiting check
-    if not await bot.rate_limiter.check_user_limit(interaction.user.id, Config.RATE_LIMIT_PER_USER):
+    if not bot.rate_limiter.check_user_limit(interaction.user.id, Config.RATE_LIMIT_PER_USER):
         await interaction.response.send_message(
             "⏰ You're rating too quickly! Please wait before trying again.",
             ephemeral=True
         )
-        await bot.log_command_usage(interaction, 'rate_strain', success=False)
+        bot.log_command_usage(interaction, 'rate_strain', success=False)
+        return
+    
+    # Validate inputs before deferring - invalid input needs no Sheets round-trip
+    cleaned_identifier = identifier.strip()
+    if not cleaned_identifier or not bot.validator.validate_rating(rating):
+        await interaction.response.send_message("❌ Invalid product identifier or rating.", ephemeral=True)
+        bot.log_command_usage(interaction, 'rate_strain', success=False)
         return
     
     await interaction.response.defer(ephemeral=True)
     
     try:
-        # Validate inputs
-        cleaned_identifier = identifier.strip()
-        if not cleaned_identifier or not bot.validator.validate_rating(rating):
-            await interaction.edit_original_response(content="❌ Invalid product identifier or rating.")
-            await bot.log_command_usage(interaction, 'rate_strain', success=False)
-            return
-        
         # Check if strain exists and is approved
         strain_data = await bot.sheets_manager.get_strain_by_identifier(cleaned_identifier, category)
         if not strain_data:
             category_filter = f" in {bot.category_names.get(category, 'unknown')} category" if category else ""
             await interaction.edit_original_response(content=f"❌ Product '{cleaned_identifier}'{category_filter} not found.")
-            await bot.log_command_usage(interaction, 'rate_strain', success=False)
+            bot.log_command_usage(interaction, 'rate_strain', success=False)
             return
         
         if strain_data['Status'] != 'Approved':
             await interaction.edit_original_response(content=f"❌ Product '{strain_data['Strain_Name']}' is not yet approved for rating.")
-            await bot.log_command_usage(interaction, 'rate_strain', success=False)
+            bot.log_command_usage(interaction, 'rate_strain', success=False)
             return
         
         # Get user display name
         username = bot.get_user_display_name(interaction.user)
         
-        # Add rating with username
-        success = await bot.sheets_manager.add_rating(cleaned_identifier, interaction.user.id, rating, username, category)
+        # Add rating with username (returns the updated strain data on success)
+        updated_strain = await bot.sheets_manager.add_rating(cleaned_identifier, interaction.user.id, rating, username, category)
         
-        if success:
-            # Get updated strain data
-            updated_strain = await bot.sheets_manager.get_strain_by_identifier(cleaned_identifier, category)
-            
+        if updated_strain:
             product_category = strain_data.get('Category', 'flower')
             category_emoji = bot.category_emojis.get(product_category, '🌿')
             category_name = bot.category_names.get(product_category, 'Flower')
@@ -972,34 +1233,33 @@ async def rate_strain(
             embed.add_field(name="Producer", value=producer, inline=True)
             embed.add_field(name="Rated by", value=username, inline=True)
             
-            if updated_strain:
-                avg_rating = updated_strain.get('Average_Rating', 0)
-                total_ratings = updated_strain.get('Total_Ratings', 0)
-                if total_ratings > 0:
-                    embed.add_field(
-                        name="Current Stats", 
-                        value=f"Average: {avg_rating}/10\nTotal Ratings: {total_ratings}", 
-                        inline=True
-                    )
-                else:
-                    embed.add_field(name="Current Stats", value="First rating!", inline=True)
+            avg_rating = updated_strain.get('Average_Rating', 0)
+            total_ratings = updated_strain.get('Total_Ratings', 0)
+            if total_ratings > 0:
+                embed.add_field(
+                    name="Current Stats", 
+                    value=f"Average: {avg_rating}/10\nTotal Ratings: {total_ratings}", 
+                    inline=True
+                )
+            else:
+                embed.add_field(name="Current Stats", value="First rating!", inline=True)
             
             embed.set_footer(text="Check the status channel for public updates")
             
             await interaction.edit_original_response(embed=embed)
-            await bot.log_command_usage(interaction, 'rate_strain', success=True)
+            bot.log_command_usage(interaction, 'rate_strain', success=True)
             
             # Update status messages after successful rating
             await bot.update_status_messages()
             
         else:
             await interaction.edit_original_response(content="❌ Failed to submit rating. You may have already rated this product.")
-            await bot.log_command_usage(interaction, 'rate_strain', success=False)
+            bot.log_command_usage(interaction, 'rate_strain', success=False)
     
     except Exception as e:
         logger.error(f"Error in rate_strain: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while submitting your rating.")
-        await bot.log_command_usage(interaction, 'rate_strain', success=False)
+        bot.log_command_usage(interaction, 'rate_strain', success=False)
 
 @bot.tree.command(name="view_strain", description="View product information and ratings with recent activity")
 @app_commands.describe(
@@ -1022,7 +1282,7 @@ async def view_strain(interaction: discord.Interaction, identifier: str, categor
         if not strain_data:
             category_filter = f" in {bot.category_names.get(category, 'unknown')} category" if category else ""
             await interaction.edit_original_response(content=f"❌ Product '{cleaned_identifier}'{category_filter} not found.")
-            await bot.log_command_usage(interaction, 'view_strain', success=False)
+            bot.log_command_usage(interaction, 'view_strain', success=False)
             return
         
         product_category = strain_data.get('Category', 'flower')
@@ -1030,30 +1290,27 @@ async def view_strain(interaction: discord.Interaction, identifier: str, categor
         category_name = bot.category_names.get(product_category, 'Flower')
         producer = strain_data.get('Producer', 'Unknown')
         
-        embed = discord.Embed(
-            title=f"{category_emoji} {strain_data['Strain_Name']}",
-            color=discord.Color.green() if strain_data['Status'] == 'Approved' else discord.Color.orange()
-        )
-        
-        embed.add_field(name="Unique ID", value=f"`{strain_data.get('Unique_ID', 'N/A')}`", inline=True)
-        embed.add_field(name="Category", value=f"{category_emoji} {category_name}", inline=True)
-        embed.add_field(name="Producer", value=producer, inline=True)
-        embed.add_field(name="Status", value=strain_data['Status'], inline=True)
+        # Assemble all details into a single description instead of one field per value
+        lines = [
+            f"**Unique ID:** `{strain_data.get('Unique_ID', 'N/A')}`",
+            f"**Category:** {category_emoji} {category_name}",
+            f"**Producer:** {producer}",
+            f"**Status:** {strain_data['Status']}"
+        ]
         
         # Add harvest and package dates
         if strain_data.get('Harvest_Date'):
-            embed.add_field(name="Harvest Date", value=strain_data['Harvest_Date'], inline=True)
+            lines.append(f"**Harvest Date:** {strain_data['Harvest_Date']}")
         if strain_data.get('Package_Date'):
-            embed.add_field(name="Package Date", value=strain_data['Package_Date'], inline=True)
+            lines.append(f"**Package Date:** {strain_data['Package_Date']}")
         
-        embed.add_field(name="Date Added", value=strain_data['Date_Added'], inline=True)
+        lines.append(f"**Date Added:** {strain_data['Date_Added']}")
         
         if strain_data['Status'] == 'Approved':
-            total_ratings = int(strain_data.get('Total_Ratings', 0))
+            total_ratings = strain_data['Total_Ratings']
             if total_ratings > 0:
-                rating_display = f"{strain_data['Average_Rating']}/10"
-                embed.add_field(name="Average Rating", value=rating_display, inline=True)
-                embed.add_field(name="Total Ratings", value=str(total_ratings), inline=True)
+                lines.append(f"**Average Rating:** {strain_data['Average_Rating']}/10")
+                lines.append(f"**Total Ratings:** {total_ratings}")
                 
                 # Get last 5 ratings with usernames (already handled by sheets manager)
                 recent_ratings = await bot.sheets_manager.get_strain_ratings_with_users(
@@ -1061,43 +1318,40 @@ async def view_strain(interaction: discord.Interaction, identifier: str, categor
                 )
                 
                 if recent_ratings:
-                    ratings_text = []
+                    lines.append("")
+                    lines.append("**Recent Ratings**")
                     for rating in recent_ratings:
-                        rating_value = rating.get('Rating', 'N/A')
-                        date_rated = rating.get('Date_Rated', 'Unknown')[:10]
-                        
                         # Use username already provided by sheets manager
                         username = rating.get('Username_Display', 'Unknown User')
-                        
-                        ratings_text.append(f"{rating_value}/10 by {username} ({date_rated})")
-                    
-                    embed.add_field(
-                        name="Recent Ratings",
-                        value="\n".join(ratings_text),
-                        inline=False
-                    )
+                        lines.append(f"{rating.get('Rating', 'N/A')}/10 by {username} ({rating['Date_Rated_Short']})")
             else:
-                embed.add_field(name="Rating", value="No ratings yet", inline=True)
-                embed.add_field(name="Total Ratings", value="0", inline=True)
+                lines.append("**Rating:** No ratings yet")
+                lines.append("**Total Ratings:** 0")
         else:
-            embed.add_field(name="Note", value="Pending moderator approval", inline=False)
+            lines.append("")
+            lines.append("**Note:** Pending moderator approval")
         
+        embed = discord.Embed(
+            title=f"{category_emoji} {strain_data['Strain_Name']}",
+            description="\n".join(lines),
+            color=discord.Color.green() if strain_data['Status'] == 'Approved' else discord.Color.orange()
+        )
         embed.set_footer(text="Use /rate_strain to add your rating!" if strain_data['Status'] == 'Approved' else "Waiting for moderator approval")
         
         await interaction.edit_original_response(embed=embed)
-        await bot.log_command_usage(interaction, 'view_strain', success=True)
+        bot.log_command_usage(interaction, 'view_strain', success=True)
     
     except Exception as e:
         logger.error(f"Error in view_strain: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while fetching product information.")
-        await bot.log_command_usage(interaction, 'view_strain', success=False)
+        bot.log_command_usage(interaction, 'view_strain', success=False)
 
 @bot.tree.command(name="pending_strains", description="[MODERATOR] List pending products with numbered approval buttons")
 async def pending_strains(interaction: discord.Interaction):
     """List pending products with clickable numbered buttons for approval"""
     if not bot.is_moderator(interaction.user):
         await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
-        await bot.log_command_usage(interaction, 'pending_strains', success=False)
+        bot.log_command_usage(interaction, 'pending_strains', success=False)
         return
     
     await interaction.response.defer(ephemeral=True)
@@ -1112,7 +1366,7 @@ async def pending_strains(interaction: discord.Interaction):
                 color=discord.Color.blue()
             )
             await interaction.edit_original_response(embed=embed)
-            await bot.log_command_usage(interaction, 'pending_strains', success=True)
+            bot.log_command_usage(interaction, 'pending_strains', success=True)
             return
         
         # Show up to 9 pending strains with numbered buttons
@@ -1125,13 +1379,12 @@ async def pending_strains(interaction: discord.Interaction):
         )
         
         for i, strain in enumerate(pending[:9], 1):
-            category = strain.get('Category', 'flower')
-            category_emoji = bot.category_emojis.get(category, '🌿')
+            cid = CAT_ID.get(strain.get('Category', 'flower'), 0)
             producer = strain.get('Producer', 'Unknown')
             
             embed.add_field(
-                name=f"{i}. {category_emoji} {strain['Strain_Name']}",
-                value=f"ID: `{strain.get('Unique_ID', 'N/A')}`\nCategory: {bot.category_names.get(category, 'Flower')}\nProducer: {producer}\nHarvest: {strain.get('Harvest_Date', 'N/A')}\nPackage: {strain.get('Package_Date', 'N/A')}\nStatus: ⏳ **Pending**",
+                name=f"{i}. {CAT_EMOJI[cid]} {strain['Strain_Name']}",
+                value=f"ID: `{strain.get('Unique_ID', 'N/A')}`\nCategory: {CAT_NAME[cid]}\nProducer: {producer}\nHarvest: {strain.get('Harvest_Date', 'N/A')}\nPackage: {strain.get('Package_Date', 'N/A')}\nStatus: ⏳ **Pending**",
                 inline=True
             )
         
@@ -1144,12 +1397,12 @@ async def pending_strains(interaction: discord.Interaction):
         view = PendingApprovalView(pending[:9], bot)
         
         await interaction.edit_original_response(embed=embed, view=view)
-        await bot.log_command_usage(interaction, 'pending_strains', success=True)
+        bot.log_command_usage(interaction, 'pending_strains', success=True)
     
     except Exception as e:
         logger.error(f"Error in pending_strains: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while fetching pending products.")
-        await bot.log_command_usage(interaction, 'pending_strains', success=False)
+        bot.log_command_usage(interaction, 'pending_strains', success=False)
 
 @bot.tree.command(name="add_producer", description="[MODERATOR] Add a new producer to the list")
 @app_commands.describe(producer_name="Name of the producer to add")
@@ -1157,21 +1410,21 @@ async def add_producer(interaction: discord.Interaction, producer_name: str):
     """Add a new producer to the valid list with persistent storage"""
     if not bot.is_moderator(interaction.user):
         await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
-        await bot.log_command_usage(interaction, 'add_producer', success=False)
+        bot.log_command_usage(interaction, 'add_producer', success=False)
+        return
+    
+    # Validate producer name before deferring - invalid input needs no Sheets round-trip
+    cleaned_name = producer_name.strip()
+    if not cleaned_name or len(cleaned_name) < 2 or len(cleaned_name) > 50:
+        await interaction.response.send_message(
+            "❌ Invalid producer name. Please use 2-50 characters.", ephemeral=True
+        )
+        bot.log_command_usage(interaction, 'add_producer', success=False)
         return
     
     await interaction.response.defer(ephemeral=True)
     
     try:
-        # Validate producer name
-        cleaned_name = producer_name.strip()
-        if not cleaned_name or len(cleaned_name) < 2 or len(cleaned_name) > 50:
-            await interaction.edit_original_response(
-                content="❌ Invalid producer name. Please use 2-50 characters."
-            )
-            await bot.log_command_usage(interaction, 'add_producer', success=False)
-            return
-        
         # Add producer to Google Sheets (this checks for duplicates)
         success = await bot.sheets_manager.add_producer(cleaned_name)
         
@@ -1191,7 +1444,7 @@ async def add_producer(interaction: discord.Interaction, producer_name: str):
             )
             embed.add_field(
                 name="All Producers", 
-                value=", ".join(bot.valid_producers), 
+                value=bot._producers_joined, 
                 inline=False
             )
             embed.add_field(
@@ -1202,17 +1455,17 @@ async def add_producer(interaction: discord.Interaction, producer_name: str):
             embed.set_footer(text=f"Added by {bot.get_user_display_name(interaction.user)}")
             
             await interaction.edit_original_response(embed=embed)
-            await bot.log_command_usage(interaction, 'add_producer', success=True)
+            bot.log_command_usage(interaction, 'add_producer', success=True)
         else:
             await interaction.edit_original_response(
                 content=f"❌ Producer '{cleaned_name}' already exists or failed to add."
             )
-            await bot.log_command_usage(interaction, 'add_producer', success=False)
+            bot.log_command_usage(interaction, 'add_producer', success=False)
         
     except Exception as e:
         logger.error(f"Error in add_producer: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while adding the producer.")
-        await bot.log_command_usage(interaction, 'add_producer', success=False)
+        bot.log_command_usage(interaction, 'add_producer', success=False)
 
 @bot.tree.command(name="remove_producer", description="[MODERATOR] Remove a producer from the list")
 @app_commands.describe(producer_name="Name of the producer to remove")
@@ -1220,29 +1473,27 @@ async def remove_producer(interaction: discord.Interaction, producer_name: str):
     """Remove a producer from the valid list with persistent storage"""
     if not bot.is_moderator(interaction.user):
         await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
-        await bot.log_command_usage(interaction, 'remove_producer', success=False)
+        bot.log_command_usage(interaction, 'remove_producer', success=False)
+        return
+    
+    # Validate producer name before deferring - these checks need no Sheets round-trip
+    cleaned_name = producer_name.strip()
+    if not cleaned_name:
+        await interaction.response.send_message("❌ Invalid producer name.", ephemeral=True)
+        bot.log_command_usage(interaction, 'remove_producer', success=False)
+        return
+    
+    # Check if producer exists in current list
+    if cleaned_name not in bot._valid_producers_set:
+        await interaction.response.send_message(
+            f"❌ Producer '{cleaned_name}' not found in the current list.", ephemeral=True
+        )
+        bot.log_command_usage(interaction, 'remove_producer', success=False)
         return
     
     await interaction.response.defer(ephemeral=True)
     
     try:
-        # Validate producer name
-        cleaned_name = producer_name.strip()
-        if not cleaned_name:
-            await interaction.edit_original_response(
-                content="❌ Invalid producer name."
-            )
-            await bot.log_command_usage(interaction, 'remove_producer', success=False)
-            return
-        
-        # Check if producer exists in current list
-        if cleaned_name not in bot.valid_producers:
-            await interaction.edit_original_response(
-                content=f"❌ Producer '{cleaned_name}' not found in the current list."
-            )
-            await bot.log_command_usage(interaction, 'remove_producer', success=False)
-            return
-        
         # Remove producer from Google Sheets
         success = await bot.sheets_manager.remove_producer(cleaned_name)
         
@@ -1262,7 +1513,7 @@ async def remove_producer(interaction: discord.Interaction, producer_name: str):
             )
             embed.add_field(
                 name="Remaining Producers", 
-                value=", ".join(bot.valid_producers) if bot.valid_producers else "None", 
+                value=bot._producers_joined or "None", 
                 inline=False
             )
             embed.add_field(
@@ -1273,43 +1524,47 @@ async def remove_producer(interaction: discord.Interaction, producer_name: str):
             embed.set_footer(text=f"Removed by {bot.get_user_display_name(interaction.user)}")
             
             await interaction.edit_original_response(embed=embed)
-            await bot.log_command_usage(interaction, 'remove_producer', success=True)
+            bot.log_command_usage(interaction, 'remove_producer', success=True)
         else:
             await interaction.edit_original_response(
                 content=f"❌ Failed to remove producer '{cleaned_name}'. Please try again."
             )
-            await bot.log_command_usage(interaction, 'remove_producer', success=False)
+            bot.log_command_usage(interaction, 'remove_producer', success=False)
         
     except Exception as e:
         logger.error(f"Error in remove_producer: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while removing the producer.")
-        await bot.log_command_usage(interaction, 'remove_producer', success=False)
+        bot.log_command_usage(interaction, 'remove_producer', success=False)
 
 @bot.tree.command(name="list_producers", description="View all available producers")
 async def list_producers(interaction: discord.Interaction):
     """List all valid producers with persistent storage info"""
-    embed = discord.Embed(
-        title="📋 Available Producers",
-        description=f"Currently {len(bot.valid_producers)} producers available:",
-        color=discord.Color.blue()
-    )
-    
-    if bot.valid_producers:
-        # Display producers in a nice format
-        producers_text = "\n".join([f"• {producer}" for producer in bot.valid_producers])
-        embed.add_field(name="Producers", value=producers_text, inline=False)
-    else:
-        embed.add_field(name="Producers", value="No producers configured", inline=False)
-    
-    embed.add_field(
-        name="Storage", 
-        value="📊 Data stored in Google Sheets (persistent across bot restarts)", 
-        inline=False
-    )
-    embed.set_footer(text="Moderators can add/remove producers with /add_producer and /remove_producer")
+    # Reuse the embed until the producer list changes
+    rev, embed = bot._producers_embed_cache or (-1, None)
+    if rev != bot._producers_rev:
+        embed = discord.Embed(
+            title="📋 Available Producers",
+            description=f"Currently {len(bot.valid_producers)} producers available:",
+            color=discord.Color.blue()
+        )
+        
+        if bot.valid_producers:
+            # Display producers in a nice format
+            producers_text = "\n".join([f"• {producer}" for producer in bot.valid_producers])
+            embed.add_field(name="Producers", value=producers_text, inline=False)
+        else:
+            embed.add_field(name="Producers", value="No producers configured", inline=False)
+        
+        embed.add_field(
+            name="Storage", 
+            value="📊 Data stored in Google Sheets (persistent across bot restarts)", 
+            inline=False
+        )
+        embed.set_footer(text="Moderators can add/remove producers with /add_producer and /remove_producer")
+        bot._producers_embed_cache = (bot._producers_rev, embed)
     
     await interaction.response.send_message(embed=embed, ephemeral=True)
-    await bot.log_command_usage(interaction, 'list_producers', success=True)
+    bot.log_command_usage(interaction, 'list_producers', success=True)
 
 @bot.tree.command(name="search_strain", description="Search for products with wildcard support")
 @app_commands.describe(
@@ -1323,21 +1578,29 @@ async def list_producers(interaction: discord.Interaction):
 ])
 async def search_strain(interaction: discord.Interaction, query: str, category: Optional[str] = None):
     """Search for products with harvest/package date display, producer info, and category filtering"""
-    await interaction.response.defer(ephemeral=True)
+    cleaned_query = query.strip()
+    if len(cleaned_query) < 2:
+        await interaction.response.send_message("❌ Search query must be at least 2 characters long.", ephemeral=True)
+        bot.log_command_usage(interaction, 'search_strain', success=False)
+        return
+    
+    # Compile wildcard queries once (matching anywhere in the name); plain queries use a substring match
+    if any(c in cleaned_query for c in "*?["):
+        search_query = re.compile(fnmatch.translate(f"*{cleaned_query}*"), re.IGNORECASE)
+    else:
+        search_query = cleaned_query
+    
+    # Start the lookup before deferring so both round-trips overlap
+    fetch = asyncio.create_task(bot.sheets_manager.search_strains(search_query, category))
+    await _defer_with_fetch(interaction, fetch)
     
     try:
-        cleaned_query = query.strip()
-        if len(cleaned_query) < 2:
-            await interaction.edit_original_response(content="❌ Search query must be at least 2 characters long.")
-            await bot.log_command_usage(interaction, 'search_strain', success=False)
-            return
-        
-        results = await bot.sheets_manager.search_strains(cleaned_query, category)
+        results = await fetch
         
         if not results:
             category_filter = f" in {bot.category_names.get(category, 'unknown')} category" if category else ""
             await interaction.edit_original_response(content=f"❌ No products found matching '{cleaned_query}'{category_filter}.")
-            await bot.log_command_usage(interaction, 'search_strain', success=False)
+            bot.log_command_usage(interaction, 'search_strain', success=False)
             return
         
         category_filter = f" ({bot.category_names.get(category, 'All categories')})" if category else ""
@@ -1347,29 +1610,32 @@ async def search_strain(interaction: discord.Interaction, query: str, category:
             color=discord.Color.blue()
         )
         
+        add = embed.add_field
         for strain in results:
             status_emoji = "✅" if strain['Status'] == 'Approved' else "⏳"
-            harvest_date = strain.get('Harvest_Date', 'N/A')
-            package_date = strain.get('Package_Date', 'N/A')
-            product_category = strain.get('Category', 'flower')
-            category_emoji = bot.category_emojis.get(product_category, '🌿')
-            producer = strain.get('Producer', 'Unknown')
+            cid = CAT_ID.get(strain.get('Category', 'flower'), 0)
             
-            embed.add_field(
-                name=f"{status_emoji} {category_emoji} {strain['Strain_Name']}",
-                value=f"ID: `{strain.get('Unique_ID', 'N/A')}`\nCategory: {bot.category_names.get(product_category, 'Flower')}\nProducer: {producer}\nHarvest: {harvest_date}\nPackage: {package_date}",
+            add(
+                name=f"{status_emoji} {CAT_EMOJI[cid]} {strain['Strain_Name']}",
+                value="\n".join((
+                    f"ID: `{strain.get('Unique_ID', 'N/A')}`",
+                    f"Category: {CAT_NAME[cid]}",
+                    f"Producer: {strain.get('Producer', 'Unknown')}",
+                    f"Harvest: {strain.get('Harvest_Date', 'N/A')}",
+                    f"Package: {strain.get('Package_Date', 'N/A')}"
+                )),
                 inline=True
             )
         
         embed.set_footer(text="Use /view_strain <name or ID> for detailed information")
         
         await interaction.edit_original_response(embed=embed)
-        await bot.log_command_usage(interaction, 'search_strain', success=True)
+        bot.log_command_usage(interaction, 'search_strain', success=True)
     
     except Exception as e:
         logger.error(f"Error in search_strain: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while searching products.")
-        await bot.log_command_usage(interaction, 'search_strain', success=False)
+        bot.log_command_usage(interaction, 'search_strain', success=False)
 
 @bot.tree.command(name="list_strains", description="List all approved products")
 @app_commands.describe(category="Filter by category (optional)")
@@ -1380,66 +1646,72 @@ async def search_strain(interaction: discord.Interaction, query: str, category:
 ])
 async def list_strains(interaction: discord.Interaction, category: Optional[str] = None):
     """List all approved products with category filtering and producer info"""
-    await interaction.response.defer(ephemeral=True)
+    # Only the first 15 are shown (embed limits) - fetch just those plus the total count,
+    # starting before the defer so both round-trips overlap
+    fetch = asyncio.create_task(bot.sheets_manager.get_top_approved_strains(category, 15))
+    await _defer_with_fetch(interaction, fetch)
     
     try:
-        strains = await bot.sheets_manager.get_all_approved_strains(category)
+        strains, total_count = await fetch
         
         if not strains:
             category_filter = f" {bot.category_names.get(category, 'unknown')} " if category else " "
             await interaction.edit_original_response(content=f"❌ No approved{category_filter}products found.")
-            await bot.log_command_usage(interaction, 'list_strains', success=True)
+            bot.log_command_usage(interaction, 'list_strains', success=True)
             return
         
         category_filter = f" {bot.category_names.get(category, 'All')} " if category else " "
         category_emoji = bot.category_emojis.get(category, '🌿') if category else '📋'
         
         embed = discord.Embed(
-            title=f"{category_emoji} All Approved{category_filter}Products ({len(strains)} total)",
+            title=f"{category_emoji} All Approved{category_filter}Products ({total_count} total)",
             description="Sorted by average rating (highest first, unrated at end)",
             color=discord.Color.green()
         )
         
-        # Show first 15 strains to avoid embed limits
-        for i, strain in enumerate(strains[:15], 1):
-            total_ratings = int(strain.get('Total_Ratings', 0))
-            harvest_date = strain.get('Harvest_Date', 'N/A')
-            package_date = strain.get('Package_Date', 'N/A')
-            product_category = strain.get('Category', 'flower')
-            strain_category_emoji = bot.category_emojis.get(product_category, '🌿')
-            producer = strain.get('Producer', 'Unknown')
+        add = embed.add_field
+        for i, strain in enumerate(strains, 1):
+            total_ratings = strain['Total_Ratings']
             
             if total_ratings > 0:
                 rating_text = f"{strain['Average_Rating']}/10"
             else:
                 rating_text = "No ratings yet"
             
-            embed.add_field(
-                name=f"{i}. {strain_category_emoji} {strain['Strain_Name']}",
-                value=f"ID: `{strain.get('Unique_ID', 'N/A')}`\nRating: {rating_text} ({total_ratings} ratings)\nProducer: {producer}\nHarvest: {harvest_date}\nPackage: {package_date}",
+            add(
+                name=f"{i}. {CAT_EMOJI[CAT_ID.get(strain.get('Category', 'flower'), 0)]} {strain['Strain_Name']}",
+                value="\n".join((
+                    f"ID: `{strain.get('Unique_ID', 'N/A')}`",
+                    f"Rating: {rating_text} ({total_ratings} ratings)",
+                    f"Producer: {strain.get('Producer', 'Unknown')}",
+                    f"Harvest: {strain.get('Harvest_Date', 'N/A')}",
+                    f"Package: {strain.get('Package_Date', 'N/A')}"
+                )),
                 inline=True
             )
         
-        if len(strains) > 15:
-            embed.set_footer(text=f"Showing first 15 of {len(strains)} products • Check status channel for top products")
+        if total_count > 15:
+            embed.set_footer(text=f"Showing first 15 of {total_count} products • Check status channel for top products")
         else:
             embed.set_footer(text="Check status channel for top products")
         
         await interaction.edit_original_response(embed=embed)
-        await bot.log_command_usage(interaction, 'list_strains', success=True)
+        bot.log_command_usage(interaction, 'list_strains', success=True)
     
     except Exception as e:
         logger.error(f"Error in list_strains: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while fetching product list.")
-        await bot.log_command_usage(interaction, 'list_strains', success=False)
+        bot.log_command_usage(interaction, 'list_strains', success=False)
 
 @bot.tree.command(name="last_submissions", description="View the last 10 product submissions")
 async def last_submissions(interaction: discord.Interaction):
     """Show last 10 product submissions with proper usernames and producer info"""
-    await interaction.response.defer(ephemeral=True)
+    # Start the lookup before deferring so both round-trips overlap
+    fetch = asyncio.create_task(bot.sheets_manager.get_last_submissions(10))
+    await _defer_with_fetch(interaction, fetch)
     
     try:
-        submissions = await bot.sheets_manager.get_last_submissions(10)
+        submissions = await fetch
         
         if not submissions:
             embed = discord.Embed(
@@ -1448,7 +1720,7 @@ async def last_submissions(interaction: discord.Interaction):
                 color=discord.Color.blue()
             )
             await interaction.edit_original_response(embed=embed)
-            await bot.log_command_usage(interaction, 'last_submissions', success=True)
+            bot.log_command_usage(interaction, 'last_submissions', success=True)
             return
         
         embed = discord.Embed(
@@ -1456,38 +1728,50 @@ async def last_submissions(interaction: discord.Interaction):
             color=discord.Color.blue()
         )
         
+        # Resolve missing usernames in one concurrent batch
+        resolved_names = await bot.resolve_display_names(
+            s.get('User_ID_Clean', 0) for s in submissions if not s.get('Username', '').strip()
+        )
+        
+        add = embed.add_field
         for i, submission in enumerate(submissions, 1):
-            user_id = submission.get('User_ID_Clean', 0)
-            # Use stored username from database if available, otherwise resolve from Discord
+            # Use stored username from database if available, otherwise the resolved Discord name
             stored_username = submission.get('Username', '').strip()
-            username = stored_username if stored_username else await bot.resolve_user_display_name(user_id)
-            
-            category = submission.get('Category', 'flower')
-            category_emoji = bot.category_emojis.get(category, '🌿')
-            producer = submission.get('Producer', 'Unknown')
+            username = stored_username or resolved_names[submission.get('User_ID_Clean', 0)]
+            cid = CAT_ID.get(submission.get('Category', 'flower'), 0)
             
-            embed.add_field(
-                name=f"{i}. {category_emoji} {submission['Strain_Name']}",
-                value=f"ID: `{submission.get('Unique_ID', 'N/A')}`\nCategory: {bot.category_names.get(category, 'Flower')}\nProducer: {producer}\nBy: {username}\nHarvest: {submission.get('Harvest_Date', 'N/A')}\nPackage: {submission.get('Package_Date', 'N/A')}\nSubmitted: {submission.get('Date_Added', 'N/A')}",
+            add(
+                name=f"{i}. {CAT_EMOJI[cid]} {submission['Strain_Name']}",
+                value="\n".join((
+                    f"ID: `{submission.get('Unique_ID', 'N/A')}`",
+                    f"Category: {CAT_NAME[cid]}",
+                    f"Producer: {submission.get('Producer', 'Unknown')}",
+                    f"By: {username}",
+                    f"Harvest: {submission.get('Harvest_Date', 'N/A')}",
+                    f"Package: {submission.get('Package_Date', 'N/A')}",
+                    f"Submitted: {submission.get('Date_Added', 'N/A')}"
+                )),
                 inline=False
             )
         
         embed.set_footer(text="This information is only visible to you")
         await interaction.edit_original_response(embed=embed)
-        await bot.log_command_usage(interaction, 'last_submissions', success=True)
+        bot.log_command_usage(interaction, 'last_submissions', success=True)
     
     except Exception as e:
         logger.error(f"Error in last_submissions: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while fetching recent submissions.")
-        await bot.log_command_usage(interaction, 'last_submissions', success=False)
+        bot.log_command_usage(interaction, 'last_submissions', success=False)
 
 @bot.tree.command(name="last_ratings", description="View the last 10 product ratings")
 async def last_ratings(interaction: discord.Interaction):
     """Show last 10 product ratings with proper usernames and producer info"""
-    await interaction.response.defer(ephemeral=True)
+    # Start the lookup before deferring so both round-trips overlap
+    fetch = asyncio.create_task(bot.sheets_manager.get_last_ratings(10))
+    await _defer_with_fetch(interaction, fetch)
     
     try:
-        ratings = await bot.sheets_manager.get_last_ratings(10)
+        ratings = await fetch
         
         if not ratings:
             embed = discord.Embed(
@@ -1496,7 +1780,7 @@ async def last_ratings(interaction: discord.Interaction):
                 color=discord.Color.blue()
             )
             await interaction.edit_original_response(embed=embed)
-            await bot.log_command_usage(interaction, 'last_ratings', success=True)
+            bot.log_command_usage(interaction, 'last_ratings', success=True)
             return
         
         embed = discord.Embed(
@@ -1504,28 +1788,33 @@ async def last_ratings(interaction: discord.Interaction):
             color=discord.Color.gold()
         )
         
+        add = embed.add_field
         for i, rating in enumerate(ratings, 1):
-            rating_stars = "⭐" * int(rating.get('Rating', 0))
-            # Use username already provided by sheets manager
-            username = rating.get('Username_Display', 'Unknown User')
-            category = rating.get('Category', 'flower')
-            category_emoji = bot.category_emojis.get(category, '🌿')
-            producer = rating.get('Producer', 'Unknown')
+            rating_stars = STAR_STRINGS[max(0, min(rating['Rating'], 10))]
+            cid = CAT_ID.get(rating.get('Category', 'flower'), 0)
             
-            embed.add_field(
-                name=f"{i}. {category_emoji} {rating.get('Strain_Name', 'Unknown')}",
-                value=f"ID: `{rating.get('Unique_ID', 'N/A')}`\nCategory: {bot.category_names.get(category, 'Flower')}\nProducer: {producer}\nRating: {rating.get('Rating', 'N/A')}/10 {rating_stars}\nBy: {username}\nRated: {rating.get('Date_Rated', 'N/A')}",
+            add(
+                name=f"{i}. {CAT_EMOJI[cid]} {rating.get('Strain_Name', 'Unknown')}",
+                value="\n".join((
+                    f"ID: `{rating.get('Unique_ID', 'N/A')}`",
+                    f"Category: {CAT_NAME[cid]}",
+                    f"Producer: {rating.get('Producer', 'Unknown')}",
+                    f"Rating: {rating.get('Rating', 'N/A')}/10 {rating_stars}",
+                    # Use username already provided by sheets manager
+                    f"By: {rating.get('Username_Display', 'Unknown User')}",
+                    f"Rated: {rating.get('Date_Rated', 'N/A')}"
+                )),
                 inline=False
             )
         
         embed.set_footer(text="Check the status channel for public recent ratings")
         await interaction.edit_original_response(embed=embed)
-        await bot.log_command_usage(interaction, 'last_ratings', success=True)
+        bot.log_command_usage(interaction, 'last_ratings', success=True)
     
     except Exception as e:
         logger.error(f"Error in last_ratings: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while fetching recent ratings.")
-        await bot.log_command_usage(interaction, 'last_ratings', success=False)
+        bot.log_command_usage(interaction, 'last_ratings', success=False)
 
 @bot.tree.command(name="approve_strain", description="[MODERATOR] Approve a pending product submission")
 @app_commands.describe(identifier="Product name or unique ID")
@@ -1533,33 +1822,36 @@ async def approve_strain(interaction: discord.Interaction, identifier: str):
     """Approve product with enhanced identifier support (traditional command)"""
     if not bot.is_moderator(interaction.user):
         await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
-        await bot.log_command_usage(interaction, 'approve_strain', success=False)
+        bot.log_command_usage(interaction, 'approve_strain', success=False)
+        return
+    
+    cleaned_identifier = identifier.strip()
+    if not cleaned_identifier:
+        await interaction.response.send_message("❌ Invalid product identifier.", ephemeral=True)
+        bot.log_command_usage(interaction, 'approve_strain', success=False)
         return
     
     await interaction.response.defer(ephemeral=True)
     
     try:
-        cleaned_identifier = identifier.strip()
-        if not cleaned_identifier:
-            await interaction.edit_original_response(content="❌ Invalid product identifier.")
-            await bot.log_command_usage(interaction, 'approve_strain', success=False)
+        # Approve strain - the same sheet pass returns the matched row
+        result = await bot.sheets_manager.approve_strain(cleaned_identifier)
+        if result is None:
+            await interaction.edit_original_response(content="❌ Failed to approve product. Please try again.")
+            bot.log_command_usage(interaction, 'approve_strain', success=False)
             return
         
-        # Check strain status
-        strain_data = await bot.sheets_manager.get_strain_by_identifier(cleaned_identifier)
+        success, strain_data = result
         if not strain_data:
             await interaction.edit_original_response(content=f"❌ Product '{cleaned_identifier}' not found.")
-            await bot.log_command_usage(interaction, 'approve_strain', success=False)
+            bot.log_command_usage(interaction, 'approve_strain', success=False)
             return
         
-        if strain_data['Status'] == 'Approved':
+        if not success and strain_data['Status'] == 'Approved':
             await interaction.edit_original_response(content=f"❌ Product '{strain_data['Strain_Name']}' is already approved.")
-            await bot.log_command_usage(interaction, 'approve_strain', success=False)
+            bot.log_command_usage(interaction, 'approve_strain', success=False)
             return
         
-        # Approve strain
-        success = await bot.sheets_manager.approve_strain(cleaned_identifier)
-        
         if success:
             category = strain_data.get('Category', 'flower')
             category_emoji = bot.category_emojis.get(category, '🌿')
@@ -1578,19 +1870,19 @@ async def approve_strain(interaction: discord.Interaction, identifier: str):
             embed.add_field(name="Package Date", value=strain_data.get('Package_Date', 'N/A'), inline=True)
             embed.set_footer(text=f"Approved by {bot.get_user_display_name(interaction.user)}")
             await interaction.edit_original_response(embed=embed)
-            await bot.log_command_usage(interaction, 'approve_strain', success=True)
+            bot.log_command_usage(interaction, 'approve_strain', success=True)
             
             # Update status messages after approval
             await bot.update_status_messages()
             
         else:
             await interaction.edit_original_response(content="❌ Failed to approve product. Please try again.")
-            await bot.log_command_usage(interaction, 'approve_strain', success=False)
+            bot.log_command_usage(interaction, 'approve_strain', success=False)
     
     except Exception as e:
         logger.error(f"Error in approve_strain: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while approving the product.")
-        await bot.log_command_usage(interaction, 'approve_strain', success=False)
+        bot.log_command_usage(interaction, 'approve_strain', success=False)
 
 @bot.tree.command(name="rename_strain", description="[MODERATOR] Rename a product using its unique ID")
 @app_commands.describe(
@@ -1601,26 +1893,33 @@ async def rename_strain(interaction: discord.Interaction, unique_id: str, new_na
     """Rename a product by unique ID"""
     if not bot.is_moderator(interaction.user):
         await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
-        await bot.log_command_usage(interaction, 'rename_strain', success=False)
+        bot.log_command_usage(interaction, 'rename_strain', success=False)
+        return
+    
+    # Validate new name before deferring - invalid input needs no Sheets round-trip
+    validated_name = bot.validator.validate_strain_name(new_name)
+    if not validated_name:
+        await interaction.response.send_message(
+            "❌ Invalid new product name. Please use 2-50 characters with letters, numbers, spaces, and basic punctuation only.",
+            ephemeral=True
+        )
+        bot.log_command_usage(interaction, 'rename_strain', success=False)
         return
     
     await interaction.response.defer(ephemeral=True)
     
     try:
-        # Validate new name
-        validated_name = bot.validator.validate_strain_name(new_name)
-        if not validated_name:
-            await interaction.edit_original_response(
-                content="❌ Invalid new product name. Please use 2-50 characters with letters, numbers, spaces, and basic punctuation only."
-            )
-            await bot.log_command_usage(interaction, 'rename_strain', success=False)
+        # Rename the strain - returns the row as it was before the rename
+        result = await bot.sheets_manager.rename_strain(unique_id.strip(), validated_name)
+        if result is None:
+            await interaction.edit_original_response(content="❌ Failed to rename product. Please try again.")
+            bot.log_command_usage(interaction, 'rename_strain', success=False)
             return
         
-        # Get current strain data
-        strain_data = await bot.sheets_manager.get_strain_by_identifier(unique_id.strip())
-        if not strain_data:
+        renamed, strain_data = result
+        if not renamed:
             await interaction.edit_original_response(content=f"❌ Product with ID '{unique_id}' not found.")
-            await bot.log_command_usage(interaction, 'rename_strain', success=False)
+            bot.log_command_usage(interaction, 'rename_strain', success=False)
             return
         
         old_name = strain_data.get('Strain_Name', 'Unknown')
@@ -1628,43 +1927,35 @@ async def rename_strain(interaction: discord.Interaction, unique_id: str, new_na
         category_emoji = bot.category_emojis.get(category, '🌿')
         producer = strain_data.get('Producer', 'Unknown')
         
-        # Rename the strain
-        success = await bot.sheets_manager.rename_strain(unique_id.strip(), validated_name)
+        embed = discord.Embed(
+            title="✅ Product Renamed Successfully",
+            description=f"{category_emoji} Product has been renamed from **{old_name}** to **{validated_name}**",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Unique ID", value=f"`{unique_id}`", inline=True)
+        embed.add_field(name="Category", value=f"{category_emoji} {bot.category_names.get(category, 'Flower')}", inline=True)
+        embed.add_field(name="Producer", value=producer, inline=True)
+        embed.add_field(name="Old Name", value=old_name, inline=True)
+        embed.add_field(name="New Name", value=validated_name, inline=True)
+        embed.set_footer(text=f"Renamed by {bot.get_user_display_name(interaction.user)}")
         
-        if success:
-            embed = discord.Embed(
-                title="✅ Product Renamed Successfully",
-                description=f"{category_emoji} Product has been renamed from **{old_name}** to **{validated_name}**",
-                color=discord.Color.green()
-            )
-            embed.add_field(name="Unique ID", value=f"`{unique_id}`", inline=True)
-            embed.add_field(name="Category", value=f"{category_emoji} {bot.category_names.get(category, 'Flower')}", inline=True)
-            embed.add_field(name="Producer", value=producer, inline=True)
-            embed.add_field(name="Old Name", value=old_name, inline=True)
-            embed.add_field(name="New Name", value=validated_name, inline=True)
-            embed.set_footer(text=f"Renamed by {bot.get_user_display_name(interaction.user)}")
-            
-            await interaction.edit_original_response(embed=embed)
-            await bot.log_command_usage(interaction, 'rename_strain', success=True)
-            
-            # Update status messages after rename
-            await bot.update_status_messages()
-            
-        else:
-            await interaction.edit_original_response(content="❌ Failed to rename product. Please try again.")
-            await bot.log_command_usage(interaction, 'rename_strain', success=False)
+        await interaction.edit_original_response(embed=embed)
+        bot.log_command_usage(interaction, 'rename_strain', success=True)
+        
+        # Update status messages after rename
+        await bot.update_status_messages()
     
     except Exception as e:
         logger.error(f"Error in rename_strain: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while renaming the product.")
-        await bot.log_command_usage(interaction, 'rename_strain', success=False)
+        bot.log_command_usage(interaction, 'rename_strain', success=False)
 
 @bot.tree.command(name="refresh_status", description="[MODERATOR] Remove old status messages and repost fresh ones")
 async def refresh_status(interaction: discord.Interaction):
     """Remove old status messages and create fresh ones"""
     if not bot.is_moderator(interaction.user):
         await interaction.response.send_message("❌ You don't have permission to use this command.", ephemeral=True)
-        await bot.log_command_usage(interaction, 'refresh_status', success=False)
+        bot.log_command_usage(interaction, 'refresh_status', success=False)
         return
     
     await interaction.response.defer(ephemeral=True)
@@ -1672,72 +1963,66 @@ async def refresh_status(interaction: discord.Interaction):
     try:
         if not bot.status_channel:
             await interaction.edit_original_response(content="❌ Status channel not configured.")
-            await bot.log_command_usage(interaction, 'refresh_status', success=False)
+            bot.log_command_usage(interaction, 'refresh_status', success=False)
             return
         
-        # Count messages to delete
-        messages_to_delete = []
-        
-        # Look through recent message history for bot's status messages
-        async for message in bot.status_channel.history(limit=200):
-            if message.author == bot.user and message.embeds:
-                embed_title = message.embeds[0].title
-                # Check if it's one of our status message types
-                if any(pattern in embed_title for pattern in [
-                    "🏆 Top 10", "⭐ Recent Ratings", "📋 Recent Submissions", "Top 10 Flower", 
-                    "Top 10 Hash", "Top 10 Rosin"
-                ]):
-                    messages_to_delete.append(message)
-        
-        # Delete old status messages
+        # Delete the tracked status messages directly
+        messages_to_delete = list(bot._status_message_refs().values())
+        
+        # Fall back to scanning recent history when nothing is tracked
+        if not messages_to_delete:
+            async for message in bot.status_channel.history(limit=200):
+                if message.author == bot.user and message.embeds:
+                    # Check if it's one of our status message types
+                    if STATUS_TITLE_RE.search(message.embeds[0].title or ""):
+                        messages_to_delete.append(message)
+        
+        # Delete old status messages - bulk delete only accepts up to 100 messages younger than 14 days
         deleted_count = 0
-        for message in messages_to_delete:
+        bulk_cutoff = discord.utils.utcnow() - timedelta(days=14)
+        bulk_messages = [m for m in messages_to_delete if m.created_at > bulk_cutoff]
+        single_messages = [m for m in messages_to_delete if m.created_at <= bulk_cutoff]
+        
+        for start in range(0, len(bulk_messages), 100):
+            chunk = bulk_messages[start:start + 100]
             try:
-                await message.delete()
+                await bot.status_channel.delete_messages(chunk)
+                deleted_count += len(chunk)
+            except discord.HTTPException as e:
+                # Handle cases where bulk delete is refused (permissions, age boundary) by deleting one by one
+                logger.warning(f"Bulk delete failed, deleting individually: {e}")
+                single_messages.extend(chunk)
+        
+        # Individual deletes run concurrently - discord.py's per-route buckets pace them
+        results = await asyncio.gather(*(message.delete() for message in single_messages), return_exceptions=True)
+        for message, result in zip(single_messages, results):
+            if isinstance(result, discord.HTTPException):
+                logger.warning(f"Failed to delete message {message.id}: {result}")
+            elif isinstance(result, BaseException):
+                raise result
+            else:
                 deleted_count += 1
-                # Small delay to avoid rate limits
-                await asyncio.sleep(0.5)
-            except Exception as e:
-                logger.warning(f"Failed to delete message {message.id}: {e}")
         
         # Clear the bot's internal message references
         bot.top_strains_messages.clear()
         bot.recent_ratings_message = None
         bot.recent_submissions_message = None
         
-        # Wait a moment before creating new messages
-        await asyncio.sleep(1)
-        
-        # Create fresh status messages
-        for category in bot.valid_categories:
-            embed = discord.Embed(
-                title=f"🏆 Top 10 {bot.category_names[category]} Products",
-                description="Loading product data...",
-                color=discord.Color.gold()
-            )
-            embed.set_footer(text="Updates automatically when new ratings are added")
-            bot.top_strains_messages[category] = await bot.status_channel.send(embed=embed)
-            
-            # Small delay between messages
-            await asyncio.sleep(0.5)
-        
-        # Create recent ratings message
-        embed = discord.Embed(
-            title="⭐ Recent Ratings",
-            description="Loading recent activity...",
-            color=discord.Color.blue()
-        )
-        embed.set_footer(text="Shows the last 10 ratings • Updates automatically")
-        bot.recent_ratings_message = await bot.status_channel.send(embed=embed)
+        # Build all placeholder embeds first, then send them in channel order
+        embeds = [
+            discord.Embed.from_dict({**_TOP_TEMPLATE, "title": f"🏆 Top 10 {bot.category_names[category]} Products"})
+            for category in bot.valid_categories
+        ]
+        embeds.append(discord.Embed.from_dict(_RATINGS_TEMPLATE))
+        embeds.append(discord.Embed.from_dict(_SUBMISSIONS_TEMPLATE))
         
-        # Create recent submissions message
-        embed = discord.Embed(
-            title="📋 Recent Submissions",
-            description="Loading recent submissions...",
-            color=discord.Color.purple()
-        )
-        embed.set_footer(text="Shows the last 10 submissions • Updates automatically")
-        bot.recent_submissions_message = await bot.status_channel.send(embed=embed)
+        # Sequential on purpose - concurrent sends would post the messages in a random order
+        sent = []
+        for embed in embeds:
+            sent.append(await bot._do_send(bot.status_channel, embed=embed))
+        bot.top_strains_messages.update(zip(bot.valid_categories, sent))
+        bot.recent_ratings_message, bot.recent_submissions_message = sent[-2:]
+        bot._save_status_message_ids()
         
         # Update with current data
         await bot.update_status_messages()
@@ -1754,14 +2039,14 @@ async def refresh_status(interaction: discord.Interaction):
         embed.set_footer(text=f"Refreshed by {bot.get_user_display_name(interaction.user)}")
         
         await interaction.edit_original_response(embed=embed)
-        await bot.log_command_usage(interaction, 'refresh_status', success=True)
+        bot.log_command_usage(interaction, 'refresh_status', success=True)
         
         logger.info(f"Status messages refreshed by {bot.get_user_display_name(interaction.user)}. Deleted: {deleted_count}, Created: {len(bot.valid_categories) + 2}")
     
     except Exception as e:
         logger.error(f"Error in refresh_status: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while refreshing status messages.")
-        await bot.log_command_usage(interaction, 'refresh_status', success=False)
+        bot.log_command_usage(interaction, 'refresh_status', success=False)
 
 @bot.tree.command(name="bot_stats", description="[MODERATOR] View bot statistics and health")
 async def bot_stats(interaction: discord.Interaction):
@@ -1773,13 +2058,14 @@ async def bot_stats(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     
     try:
-        # Check for pending strains notification
-        await bot.check_and_notify_moderators(interaction.guild)
+        # Read the pending count once and reuse it for the moderator notification check
+        pending_count = await bot.sheets_manager.get_pending_strains_count()
+        await bot.check_and_notify_moderators(interaction.guild, pending_count)
         
         embed = discord.Embed(
             title="🤖 Bot Statistics",
             color=discord.Color.blue(),
-            timestamp=datetime.utcnow()
+            timestamp=discord.utils.utcnow()
         )
         
         # Basic stats
@@ -1787,7 +2073,6 @@ async def bot_stats(interaction: discord.Interaction):
         embed.add_field(name="Latency", value=f"{round(bot.latency * 1000, 2)}ms", inline=True)
         
         # Pending strains count
-        pending_count = await bot.sheets_manager.get_pending_strains_count()
         embed.add_field(name="Pending Products", value=str(pending_count), inline=True)
         
         # Status channel info
@@ -1800,7 +2085,7 @@ async def bot_stats(interaction: discord.Interaction):
         
         # Most used commands
         if total_commands > 0:
-            most_used = max(bot.command_stats.items(), key=lambda x: x[1])
+            most_used = bot.command_stats.most_common(1)[0]
             embed.add_field(name="Most Used Command", value=f"{most_used[0]} ({most_used[1]})", inline=True)
         
         # Cache stats
@@ -1814,7 +2099,8 @@ async def bot_stats(interaction: discord.Interaction):
         embed.add_field(name="Supported Categories", value="🌿 Flower, 🍯 Hash, 🧈 Rosin", inline=False)
         
         # Command breakdown
-        command_list = "\n".join([f"{cmd}: {count}" for cmd, count in bot.command_stats.items() if count > 0])
+        # Top 25 keeps the field under Discord's 1024 character limit
+        command_list = "\n".join(f"{cmd}: {count}" for cmd, count in bot.command_stats.most_common(25) if count)
         if command_list:
             embed.add_field(name="Command Usage Breakdown", value=f"```{command_list}```", inline=False)
         
@@ -1823,41 +2109,45 @@ async def bot_stats(interaction: discord.Interaction):
         
         embed.set_footer(text="This information is only visible to you")
         await interaction.edit_original_response(embed=embed)
-        await bot.log_command_usage(interaction, 'bot_stats', success=True)
+        bot.log_command_usage(interaction, 'bot_stats', success=True)
     
     except Exception as e:
         logger.error(f"Error in bot_stats: {e}", exc_info=True)
         await interaction.edit_original_response(content="❌ An error occurred while fetching bot statistics.")
-        await bot.log_command_usage(interaction, 'bot_stats', success=False)
+        bot.log_command_usage(interaction, 'bot_stats', success=False)
 
 # Error handling and shutdown
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
     """Enhanced error handling with logging"""
-    if isinstance(error, app_commands.CommandOnCooldown):
-        await interaction.response.send_message(
-            f"⏰ Command is on cooldown. Try again in {error.retry_after:.1f} seconds.",
-            ephemeral=True
-        )
-    elif isinstance(error, app_commands.MissingPermissions):
-        await interaction.response.send_message(
-            "❌ You don't have permission to use this command.",
-            ephemeral=True
-        )
+    render = _ERROR_MAP.get(type(error))
+    if render is None:
+        # Log before sending so a suppressed send failure can't hide the error
+        logger.error(f"Unhandled command error: {error}", exc_info=error)
+        message = "❌ An unexpected error occurred. Please try again later."
     else:
-        logger.error(f"Unhandled command error: {error}", exc_info=True)
-        try:
-            await interaction.response.send_message(
-                "❌ An unexpected error occurred. Please try again later.",
-                ephemeral=True
-            )
-        except:
-            pass
+        message = render(error)
+    
+    # The interaction may have expired or already been answered by the command
+    with contextlib.suppress(discord.HTTPException, discord.InteractionResponded):
+        await interaction.response.send_message(message, ephemeral=True)
 
 async def shutdown_handler():
     """Handle graceful shutdown"""
     logger.info("Shutting down bot...")
+
+    # Stop moderator alert sweep
+    if bot._mod_alert_sweep_task:
+        bot._mod_alert_sweep_task.cancel()
+    
+    # Stop stats flushing and write what is still buffered
+    if bot._stats_flush_task:
+        bot._stats_flush_task.cancel()
+    bot.stats_store.close()
     
+    if bot._log_flush_task:
+        bot._log_flush_task.cancel()
+
     # Stop health monitor
     if hasattr(bot, 'health_monitor'):
         await bot.health_monitor.stop_health_server()
@@ -1887,8 +2177,19 @@ async def main():
 
 if __name__ == '__main__':
     try:
-        asyncio.run(main())
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        # uvloop is optional (unavailable on Windows) - fall back to the default asyncio loop
+        loop_factory = None
+    
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
+    finally:
+        # Drain queued log records and flush the log file - after the final error logging above
+        stop_logging()
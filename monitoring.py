@@ -1,19 +1,43 @@
 # monitoring.py - Complete health monitoring and logging system
 import logging
-import json
-from datetime import datetime
+import logging.handlers
+import queue
+import time
+import orjson
 from aiohttp import web
+from prometheus_client import CollectorRegistry, Gauge, generate_latest, CONTENT_TYPE_LATEST
 import asyncio
 from typing import Optional
 
+# Last formatted UTC second: (epoch_second, "YYYY-MM-DDTHH:MM:SS") - rebound atomically, shared across threads
+_ts_cache = (0, '')
+
+def _iso_second(epoch_second: int) -> str:
+    """ISO 8601 UTC string for a whole epoch second, reformatted only when the second changes"""
+    global _ts_cache
+    cached_second, cached_iso = _ts_cache
+    if epoch_second != cached_second:
+        cached_iso = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(epoch_second))
+        _ts_cache = (epoch_second, cached_iso)
+    return cached_iso
+
+def _iso_now() -> str:
+    """Current UTC time as an ISO 8601 string at second resolution"""
+    return _iso_second(int(time.time())) + 'Z'
+
+def _orjson_dumps(obj) -> str:
+    """orjson serializer for aiohttp json_response"""
+    return orjson.dumps(obj).decode()
+
 class StructuredFormatter(logging.Formatter):
     """JSON structured logging formatter"""
     
     def format(self, record):
+        msg = record.getMessage()
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': f"{_iso_second(int(record.created))}.{int(record.msecs):03d}Z",
             'level': record.levelname,
-            'message': record.getMessage(),
+            'message': msg,
             'module': record.module,
             'function': record.funcName,
             'line': record.lineno
@@ -27,83 +51,202 @@ class StructuredFormatter(logging.Formatter):
         if hasattr(record, 'command_name'):
             log_entry['command_name'] = record.command_name
         
-        return json.dumps(log_entry)
+        # Traceback as its own field, formatted only when the record carries one (once for all handlers)
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_entry['exc'] = record.exc_text
+        
+        return orjson.dumps(log_entry).decode()
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for an in-process queue - enqueues records as-is so formatting happens on the listener thread"""
+    
+    __slots__ = ()
+    
+    def prepare(self, record):
+        # The base implementation formats the message and folds the traceback into it so the
+        # record can be pickled - not needed here, and it would drop exc_info before StructuredFormatter
+        return record
+
+# Background log writer state (owned by setup_logging)
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_memory_handler: Optional[logging.handlers.MemoryHandler] = None
+_file_handler: Optional[logging.FileHandler] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
 
 def setup_logging(level: str = 'INFO'):
-    """Configure structured logging"""
+    """Configure structured logging - callers only enqueue, a listener thread does the writes"""
+    global _log_listener, _memory_handler, _file_handler, _queue_handler
+    
     # Create formatter
     formatter = StructuredFormatter()
     
-    # File handler
+    # File handler, buffered - records are written in batches, ERROR and above immediately
     file_handler = logging.FileHandler('strain_bot.log')
     file_handler.setFormatter(formatter)
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+    )
     
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     
+    # Replace any previous listener
+    stop_logging()
+    
     # Configure root logger
+    log_queue = queue.SimpleQueue()
     logger = logging.getLogger()
     logger.handlers.clear()
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    _queue_handler = _LocalQueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
     logger.setLevel(getattr(logging, level.upper()))
     
+    _memory_handler = memory_handler
+    _file_handler = file_handler
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, memory_handler, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    
     return logger
 
+def flush_logging():
+    """Write out log records buffered for the log file (blocking file I/O - call from a worker thread)"""
+    if _memory_handler:
+        _memory_handler.flush()
+
+def stop_logging():
+    """Drain the log queue, stop the listener thread and flush and close the log file"""
+    global _log_listener, _memory_handler, _file_handler, _queue_handler
+    # Detach the queue first so nothing is enqueued after the listener stops
+    # (later records fall back to logging.lastResort on stderr)
+    if _queue_handler:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _log_listener:
+        _log_listener.stop()
+        _log_listener = None
+    if _memory_handler:
+        # Flushes the buffer to the file handler and detaches it (target becomes None)
+        _memory_handler.close()
+        _memory_handler = None
+    if _file_handler:
+        _file_handler.close()
+        _file_handler = None
+
 class HealthMonitor:
     """Health monitoring for the bot"""
     
+    __slots__ = (
+        'bot', 'app', 'runner', 'site',
+        'registry', 'g_guilds', 'g_latency', 'g_ready', 'metrics_interval', '_metrics_task',
+        'sheets_probe_interval', 'sheets_probe_timeout', '_sheets_ok', '_sheets_probe_task',
+        '_health_cache', 'health_cache_ttl'
+    )
+    
     def __init__(self, bot):
         self.bot = bot
         self.app: Optional[web.Application] = None
         self.runner: Optional[web.AppRunner] = None
         self.site: Optional[web.TCPSite] = None
+        
+        # Gauges are set on Discord events and by _metrics_loop, scrapes only serialize the registry
+        self.registry = CollectorRegistry()
+        self.g_guilds = Gauge('discord_bot_guilds', 'Number of guilds the bot is in', registry=self.registry)
+        self.g_latency = Gauge('discord_bot_latency_seconds', 'Discord websocket latency', registry=self.registry)
+        self.g_ready = Gauge('discord_bot_ready', 'Whether the bot is connected and ready', registry=self.registry)
+        self.metrics_interval = 5
+        self._metrics_task: Optional[asyncio.Task] = None
+        
+        # Sheets liveness is probed in the background and /health reads the last result
+        self.sheets_probe_interval = 10
+        self.sheets_probe_timeout = 3.0
+        self._sheets_ok = False
+        self._sheets_probe_task: Optional[asyncio.Task] = None
+        self._health_cache: tuple = (0.0, None, b'')  # (monotonic time rendered, probe results, body)
+        self.health_cache_ttl = 1.0
     
     async def health_check(self, request):
         """Health check endpoint"""
         try:
-            # Test Google Sheets connection
-            sheets_healthy = await self._test_sheets_connection()
-            
-            # Test Discord connection
-            discord_healthy = self.bot.is_ready()
+            # Both probes are cached flags - no executor round-trip per request
+            sheets_healthy = self._test_sheets_connection()
+            discord_healthy = self._test_discord_connection()
+            guild_count = len(self.bot.guilds) if discord_healthy else 0
             
-            status = {
-                'status': 'healthy' if sheets_healthy and discord_healthy else 'unhealthy',
-                'timestamp': datetime.utcnow().isoformat(),
-                'services': {
-                    'discord': {
-                        'status': 'healthy' if discord_healthy else 'unhealthy',
-                        'guilds': len(self.bot.guilds) if discord_healthy else 0,
-                        'latency_ms': round(self.bot.latency * 1000, 2) if discord_healthy else None
-                    },
-                    'google_sheets': {
-                        'status': 'healthy' if sheets_healthy else 'unhealthy'
+            # Identical probe results within the TTL reuse the already encoded body
+            now = time.monotonic()
+            probe_results = (sheets_healthy, discord_healthy, guild_count)
+            rendered_at, cached_results, body = self._health_cache
+            if cached_results != probe_results or now - rendered_at >= self.health_cache_ttl:
+                status = {
+                    'status': 'healthy' if sheets_healthy and discord_healthy else 'unhealthy',
+                    'timestamp': _iso_now(),
+                    'services': {
+                        'discord': {
+                            'status': 'healthy' if discord_healthy else 'unhealthy',
+                            'guilds': guild_count,
+                            'latency_ms': round(self.bot.latency * 1000, 2) if discord_healthy else None
+                        },
+                        'google_sheets': {
+                            'status': 'healthy' if sheets_healthy else 'unhealthy'
+                        }
                     }
                 }
-            }
+                body = orjson.dumps(status)
+                self._health_cache = (now, probe_results, body)
             
-            status_code = 200 if status['status'] == 'healthy' else 503
-            return web.json_response(status, status=status_code)
+            status_code = 200 if sheets_healthy and discord_healthy else 503
+            return web.Response(body=body, status=status_code, content_type='application/json')
         
         except Exception as e:
             return web.json_response({
                 'status': 'unhealthy',
                 'error': str(e),
-                'timestamp': datetime.utcnow().isoformat()
-            }, status=503)
+                'timestamp': _iso_now()
+            }, status=503, dumps=_orjson_dumps)
     
-    async def _test_sheets_connection(self) -> bool:
-        """Test Google Sheets connection"""
-        try:
-            # Simple test operation
-            if hasattr(self.bot, 'sheets_manager') and hasattr(self.bot.sheets_manager, 'safe_operation'):
-                result = await self.bot.sheets_manager.safe_operation(lambda: True)
-                return result is not None
-            return False
-        except:
-            return False
+    def _test_discord_connection(self) -> bool:
+        """Test Discord connection"""
+        return self.bot.is_ready()
+    
+    def _test_sheets_connection(self) -> bool:
+        """Last Google Sheets probe result (refreshed by _sheets_probe_loop)"""
+        return self._sheets_ok
+    
+    async def _sheets_probe_loop(self):
+        """Periodically check the sheets connection and executor responsiveness"""
+        while True:
+            try:
+                # Bypasses safe_operation's lock - a long refresh or write holding it is not an outage
+                if hasattr(self.bot, 'sheets_manager') and hasattr(self.bot.sheets_manager, 'check_connection'):
+                    self._sheets_ok = await asyncio.wait_for(
+                        self.bot.sheets_manager.check_connection(),
+                        timeout=self.sheets_probe_timeout
+                    ) is True
+                else:
+                    self._sheets_ok = False
+            except Exception:
+                self._sheets_ok = False
+            await asyncio.sleep(self.sheets_probe_interval)
+    
+    def update_metrics(self):
+        """Set the gauges from the current bot state"""
+        self.g_guilds.set(len(self.bot.guilds))
+        self.g_latency.set(self.bot.latency)
+        self.g_ready.set(1 if self.bot.is_ready() else 0)
+    
+    async def _metrics_loop(self):
+        """Refresh the gauges periodically (latency changes without an event)"""
+        while True:
+            try:
+                self.update_metrics()
+            except Exception as e:
+                logging.error(f"Failed to update metrics: {e}")
+            await asyncio.sleep(self.metrics_interval)
     
     async def start_health_server(self, port: int = 8080):
         """Start health check server"""
@@ -118,6 +261,11 @@ class HealthMonitor:
             self.site = web.TCPSite(self.runner, '0.0.0.0', port)
             await self.site.start()
             
+            if self._sheets_probe_task is None or self._sheets_probe_task.done():
+                self._sheets_probe_task = asyncio.create_task(self._sheets_probe_loop())
+            if self._metrics_task is None or self._metrics_task.done():
+                self._metrics_task = asyncio.create_task(self._metrics_loop())
+            
             logging.info(f"Health check server started on port {port}")
         except Exception as e:
             logging.error(f"Failed to start health server: {e}")
@@ -125,18 +273,19 @@ class HealthMonitor:
     async def metrics_endpoint(self, request):
         """Prometheus-style metrics endpoint"""
         try:
-            metrics = [
-                f'discord_bot_guilds {len(self.bot.guilds)}',
-                f'discord_bot_latency_seconds {self.bot.latency}',
-                f'discord_bot_ready {1 if self.bot.is_ready() else 0}',
-            ]
-            
-            return web.Response(text='\n'.join(metrics), content_type='text/plain')
+            return web.Response(
+                body=generate_latest(self.registry),
+                headers={'Content-Type': CONTENT_TYPE_LATEST}
+            )
         except Exception as e:
             return web.Response(text=f'# Error generating metrics: {e}', status=500)
     
     async def stop_health_server(self):
         """Stop health check server"""
+        if self._sheets_probe_task:
+            self._sheets_probe_task.cancel()
+        if self._metrics_task:
+            self._metrics_task.cancel()
         try:
             if self.site:
                 await self.site.stop()
@@ -1,50 +1,77 @@
 # rate_limiter.py - Advanced rate limiting system
 import time
+from array import array
+from bisect import bisect_right
 from collections import defaultdict
-from typing import Dict, List
-import asyncio
+from typing import Dict
 
 class AdvancedRateLimiter:
     """Advanced rate limiting with per-user and per-guild limits"""
     
+    __slots__ = ('user_requests', 'guild_requests', 'sweep_interval', '_last_sweep', '_max_window')
+    
     def __init__(self):
-        self.user_requests: Dict[int, List[float]] = defaultdict(list)
-        self.guild_requests: Dict[int, List[float]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+        # Only used from the bot's event loop - asyncio never preempts plain (non-awaiting) code,
+        # so the checks are atomic without a lock and are synchronous methods
+        
+        # Call timestamps per key as dense C doubles, appended in ascending (monotonic) order
+        self.user_requests: Dict[int, array] = defaultdict(self._new_calls)
+        self.guild_requests: Dict[int, array] = defaultdict(self._new_calls)
+        
+        # Periodic eviction of idle keys so the dicts don't grow with every user ever seen
+        self.sweep_interval = 300
+        self._last_sweep = time.monotonic()
+        self._max_window = 0
+    
+    def _sweep(self, now: float):
+        """Evict keys with no timestamps inside the largest window in use"""
+        cutoff = now - self._max_window
+        for requests in (self.user_requests, self.guild_requests):
+            idle = [key for key, calls in requests.items() if not calls or calls[-1] <= cutoff]
+            for key in idle:
+                del requests[key]
+        self._last_sweep = now
+    
+    @staticmethod
+    def _new_calls() -> array:
+        """Empty timestamp buffer for a new key"""
+        return array('d')
     
-    async def check_user_limit(self, user_id: int, limit: int = 5, window: int = 60) -> bool:
+    @staticmethod
+    def _expire(calls: array, now: float, window: int):
+        """Drop timestamps that have left the window - one binary search and one slice delete"""
+        expired = bisect_right(calls, now - window)
+        if expired:
+            del calls[:expired]
+    
+    def _check(self, requests: Dict[int, array], key: int, limit: int, window: int) -> bool:
+        """Record a call for key if it fits within the limit"""
+        now = time.monotonic()
+        if window > self._max_window:
+            self._max_window = window
+        # Sweep before looking up the key so its timestamps can't be evicted mid-check
+        if now - self._last_sweep > self.sweep_interval:
+            self._sweep(now)
+        
+        calls = requests[key]
+        self._expire(calls, now, window)
+        
+        if len(calls) >= limit:
+            return False
+        
+        calls.append(now)
+        return True
+    
+    def check_user_limit(self, user_id: int, limit: int = 5, window: int = 60) -> bool:
         """Check if user is within rate limit"""
-        async with self._lock:
-            now = time.time()
-            user_calls = self.user_requests[user_id]
-            
-            # Clean old requests
-            user_calls[:] = [call for call in user_calls if now - call < window]
-            
-            if len(user_calls) >= limit:
-                return False
-            
-            user_calls.append(now)
-            return True
-    
-    async def check_guild_limit(self, guild_id: int, limit: int = 50, window: int = 60) -> bool:
+        return self._check(self.user_requests, user_id, limit, window)
+    
+    def check_guild_limit(self, guild_id: int, limit: int = 50, window: int = 60) -> bool:
         """Check if guild is within rate limit"""
-        async with self._lock:
-            now = time.time()
-            guild_calls = self.guild_requests[guild_id]
-            
-            # Clean old requests
-            guild_calls[:] = [call for call in guild_calls if now - call < window]
-            
-            if len(guild_calls) >= limit:
-                return False
-            
-            guild_calls.append(now)
-            return True
+        return self._check(self.guild_requests, guild_id, limit, window)
     
     def get_user_remaining_calls(self, user_id: int, limit: int = 5, window: int = 60) -> int:
         """Get remaining calls for user"""
-        now = time.time()
         user_calls = self.user_requests[user_id]
-        user_calls[:] = [call for call in user_calls if now - call < window]
+        self._expire(user_calls, time.monotonic(), window)
         return max(0, limit - len(user_calls))
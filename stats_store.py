@@ -0,0 +1,65 @@
+# stats_store.py - Local SQLite persistence for command usage statistics
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CommandStatsStore:
+    """WAL-mode SQLite log of command invocations - records are buffered in memory and written in batches"""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS command_log (
+                user_id INTEGER,
+                guild_id INTEGER,
+                command_name TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                ts REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_command_log_name ON command_log (command_name)")
+        self._pending: List[Tuple] = []
+
+    def record(self, user_id: int, guild_id: Optional[int], command_name: str, success: bool):
+        """Buffer one command invocation (no disk I/O)"""
+        self._pending.append((user_id, guild_id, command_name, int(success), time.time()))
+
+    def flush(self) -> int:
+        """Write all buffered invocations in a single transaction"""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, []
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "INSERT INTO command_log (user_id, guild_id, command_name, success, ts) VALUES (?, ?, ?, ?, ?)",
+                pending
+            )
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            # Keep the records for the next flush
+            self._pending[:0] = pending
+            raise
+        return len(pending)
+
+    def load_counts(self) -> Dict[str, int]:
+        """Total invocations per command name"""
+        rows = self._conn.execute(
+            "SELECT command_name, COUNT(*) FROM command_log GROUP BY command_name"
+        ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Flush remaining records and close the database"""
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to flush command stats on close: {e}")
+        self._conn.close()